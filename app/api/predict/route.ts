@@ -1,12 +1,99 @@
 import { type NextRequest, NextResponse } from "next/server"
 
 const DJANGO_API_URL = process.env.DJANGO_API_URL || "http://localhost:8000"
+const EDGE_MODEL_TTL_MS = 5 * 60 * 1000
+
+type EdgeModel = {
+  version: string
+  intercept: number
+  coefficients: Record<string, number>
+  encoding: {
+    title_pattern: string
+    common_titles: string[]
+    rare_title: string
+    unknown_deck: string
+    age_bins: number[]
+    age_labels: string[]
+    threshold: number
+  }
+  metrics: {
+    val_score: number
+    accuracy_gap: number
+  }
+}
+
+// Coeficientes entrenados (scripts/04_train_edge_model.py), revalidados con ETag contra Django
+let edgeModel: EdgeModel | null = null
+let edgeModelEtag: string | null = null
+let edgeModelCheckedAt = 0
+
+async function refreshEdgeModel() {
+  if (Date.now() - edgeModelCheckedAt < EDGE_MODEL_TTL_MS) return
+  edgeModelCheckedAt = Date.now()
+  try {
+    const response = await fetch(`${DJANGO_API_URL}/api/edge-model/`, {
+      headers: edgeModelEtag ? { "If-None-Match": edgeModelEtag } : {},
+      cache: "no-store",
+    })
+    if (response.status === 200) {
+      edgeModel = await response.json()
+      edgeModelEtag = response.headers.get("ETag")
+    }
+  } catch (error) {
+    // Django no disponible: se conserva la última versión descargada
+  }
+}
+
+function edgeModelProbability(model: EdgeModel, input: Record<string, any>) {
+  const { encoding } = model
+  const age = Number.parseFloat(input.age)
+  const sibsp = Number.parseInt(input.sibsp)
+  const parch = Number.parseInt(input.parch)
+  const familySize = sibsp + parch + 1
+
+  let title: string
+  const match = input.name ? new RegExp(encoding.title_pattern).exec(input.name) : null
+  if (match) {
+    title = encoding.common_titles.includes(match[1]) ? match[1] : encoding.rare_title
+  } else if (input.sex === "male") {
+    title = age < 18 ? "Master" : "Mr"
+  } else {
+    title = age < 18 ? "Miss" : "Mrs"
+  }
+
+  const deck = input.cabin ? String(input.cabin)[0] : encoding.unknown_deck
+  const ageGroup = encoding.age_labels.find(
+    (_, i) => age > encoding.age_bins[i] && age <= encoding.age_bins[i + 1],
+  )
+
+  const features: Record<string, number> = {
+    Pclass: Number.parseInt(input.pclass),
+    SibSp: sibsp,
+    Parch: parch,
+    Fare: Number.parseFloat(input.fare),
+    FamilySize: familySize,
+    IsAlone: familySize === 1 ? 1 : 0,
+    [`Sex_${input.sex}`]: 1,
+    [`Embarked_${input.embarked}`]: 1,
+    [`Title_${title}`]: 1,
+    [`Deck_${deck}`]: 1,
+  }
+  if (ageGroup) features[`Age_Group_${ageGroup}`] = 1
+
+  let logit = model.intercept
+  for (const [feature, value] of Object.entries(features)) {
+    logit += (model.coefficients[feature] ?? 0) * value
+  }
+  return 1 / (1 + Math.exp(-logit))
+}
 
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json()
     const { pclass, sex, age, sibsp, parch, fare, embarked, name, ticket, cabin } = body
 
+    void refreshEdgeModel()
+
     try {
       const response = await fetch(`${DJANGO_API_URL}/api/predict/`, {
         method: "POST",
@@ -39,57 +126,26 @@ export async function POST(request: NextRequest) {
             : `Tus probabilidades de supervivencia eran ${data.survival_chance.toLowerCase()}: ${(data.probability * 100).toFixed(1)}%`,
           model_type: data.model_type,
           model_accuracy: data.model_accuracy,
+          model_tier: data.model_tier,
         })
       }
     } catch (error) {
       console.log("[v0] Servidor Django no disponible, usando modelo fallback")
     }
 
-    const sexNumeric = sex === "male" ? 1 : 0
-    const ageNumeric = Number.parseFloat(age)
-    const sibspNumeric = Number.parseInt(sibsp)
-    const parchNumeric = Number.parseInt(parch)
-    const fareNumeric = Number.parseFloat(fare)
-    const pclassNumeric = Number.parseInt(pclass)
-
-    const embarkedS = embarked === "S" ? 1 : 0
-    const embarkedC = embarked === "C" ? 1 : 0
-    const embarkedQ = embarked === "Q" ? 1 : 0
-
-    const familySize = sibspNumeric + parchNumeric + 1
-    const isAlone = familySize === 1 ? 1 : 0
-
-    const coefficients = {
-      intercept: 0.5,
-      pclass: -1.2,
-      sex: -2.5,
-      age: -0.01,
-      sibsp: -0.3,
-      parch: -0.1,
-      fare: 0.002,
-      embarkedS: -0.3,
-      embarkedC: 0.5,
-      embarkedQ: -0.2,
-      familySize: -0.2,
-      isAlone: 0.1,
-    }
+    let probability: number
+    let modelType: string
+    let modelAccuracy: number | undefined
 
-    const logit =
-      coefficients.intercept +
-      coefficients.pclass * pclassNumeric +
-      coefficients.sex * sexNumeric +
-      coefficients.age * ageNumeric +
-      coefficients.sibsp * sibspNumeric +
-      coefficients.parch * parchNumeric +
-      coefficients.fare * fareNumeric +
-      coefficients.embarkedS * embarkedS +
-      coefficients.embarkedC * embarkedC +
-      coefficients.embarkedQ * embarkedQ +
-      coefficients.familySize * familySize +
-      coefficients.isAlone * isAlone
-
-    const probability = 1 / (1 + Math.exp(-logit))
-    const survived = probability > 0.5
+    if (edgeModel) {
+      probability = edgeModelProbability(edgeModel, body)
+      modelType = `Logistic Regression (edge ${edgeModel.version})`
+      modelAccuracy = edgeModel.metrics.val_score
+    } else {
+      probability = handWrittenProbability(body)
+      modelType = "fallback (JavaScript)"
+    }
+    const survived = probability > (edgeModel?.encoding.threshold ?? 0.5)
 
     let message = ""
     if (survived) {
@@ -114,10 +170,60 @@ export async function POST(request: NextRequest) {
       survived,
       probability,
       message,
-      model_type: "fallback (JavaScript)",
+      model_type: modelType,
+      model_accuracy: modelAccuracy,
     })
   } catch (error) {
     console.error("[v0] Error en predicción:", error)
     return NextResponse.json({ error: "Error al procesar la predicción" }, { status: 500 })
   }
 }
+
+// Último recurso si nunca se pudo descargar el modelo compacto entrenado
+function handWrittenProbability(input: Record<string, any>) {
+  const { pclass, sex, age, sibsp, parch, fare, embarked } = input
+  const sexNumeric = sex === "male" ? 1 : 0
+  const ageNumeric = Number.parseFloat(age)
+  const sibspNumeric = Number.parseInt(sibsp)
+  const parchNumeric = Number.parseInt(parch)
+  const fareNumeric = Number.parseFloat(fare)
+  const pclassNumeric = Number.parseInt(pclass)
+
+  const embarkedS = embarked === "S" ? 1 : 0
+  const embarkedC = embarked === "C" ? 1 : 0
+  const embarkedQ = embarked === "Q" ? 1 : 0
+
+  const familySize = sibspNumeric + parchNumeric + 1
+  const isAlone = familySize === 1 ? 1 : 0
+
+  const coefficients = {
+    intercept: 0.5,
+    pclass: -1.2,
+    sex: -2.5,
+    age: -0.01,
+    sibsp: -0.3,
+    parch: -0.1,
+    fare: 0.002,
+    embarkedS: -0.3,
+    embarkedC: 0.5,
+    embarkedQ: -0.2,
+    familySize: -0.2,
+    isAlone: 0.1,
+  }
+
+  const logit =
+    coefficients.intercept +
+    coefficients.pclass * pclassNumeric +
+    coefficients.sex * sexNumeric +
+    coefficients.age * ageNumeric +
+    coefficients.sibsp * sibspNumeric +
+    coefficients.parch * parchNumeric +
+    coefficients.fare * fareNumeric +
+    coefficients.embarkedS * embarkedS +
+    coefficients.embarkedC * embarkedC +
+    coefficients.embarkedQ * embarkedQ +
+    coefficients.familySize * familySize +
+    coefficients.isAlone * isAlone
+
+  return 1 / (1 + Math.exp(-logit))
+}
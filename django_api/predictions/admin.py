@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import PredictionLog
+
+
+@admin.register(PredictionLog)
+class PredictionLogAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'model_version', 'survived', 'probability', 'survival_chance', 'latency_ms')
+    list_filter = ('model_version', 'survived', 'survival_chance')
+    date_hierarchy = 'created_at'
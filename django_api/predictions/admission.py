@@ -0,0 +1,110 @@
+"""
+Admission control and graceful degradation for predict_survival.
+
+The controller tracks requests in flight and an exponentially weighted moving
+average of recent request latency. Each request is admitted to the primary
+tier, admitted to the cheaper degraded tier (edge logistic model, or the forest
+with early exit when no edge model is available) once DEGRADE_IN_FLIGHT or
+LATENCY_SLO_MS is crossed, or rejected with a Retry-After hint beyond
+MAX_IN_FLIGHT. Counters per tier are exposed on /api/admission/; failed
+requests are counted as errors and kept out of the latency average.
+"""
+import threading
+
+from django.conf import settings
+
+DEFAULTS = {
+    'ENABLED': False,
+    'MAX_IN_FLIGHT': 32,            # reject beyond this many concurrent requests
+    'DEGRADE_IN_FLIGHT': 16,        # use the degraded tier beyond this many
+    'LATENCY_SLO_MS': 200.0,        # ...or while the latency average is above the SLO
+    'LATENCY_EWMA_ALPHA': 0.1,
+    'RETRY_AFTER_SECONDS': 1,
+    'DEGRADED_BUDGET_MS': 10.0,     # latency budget for the early-exit forest tier
+}
+
+PRIMARY = 'primary'
+DEGRADED = 'degraded'
+
+
+class AdmissionController:
+    """Decides per request whether to serve it fully, cheaply, or not at all"""
+
+    def __init__(self, max_in_flight, degrade_in_flight, latency_slo_ms, alpha, retry_after,
+                 degraded_budget_ms):
+        self.max_in_flight = max_in_flight
+        self.degrade_in_flight = degrade_in_flight
+        self.latency_slo_ms = latency_slo_ms
+        self.alpha = alpha
+        self.retry_after = retry_after
+        self.degraded_budget_ms = degraded_budget_ms
+
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.latency_ewma_ms = 0.0
+        self.rejected = 0
+        self.served = {}
+        self.errors = {}
+
+    def acquire(self):
+        """Return PRIMARY or DEGRADED for an admitted request, or None to reject it"""
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                self.rejected += 1
+                return None
+            self.in_flight += 1
+            if self.in_flight > self.degrade_in_flight or self.latency_ewma_ms > self.latency_slo_ms:
+                return DEGRADED
+            return PRIMARY
+
+    def release(self, tier, latency_ms, succeeded):
+        """Record a finished request; `tier` is the tier that handled it"""
+        with self._lock:
+            self.in_flight -= 1
+            if not succeeded:
+                self.errors[tier] = self.errors.get(tier, 0) + 1
+                return
+            self.latency_ewma_ms += self.alpha * (latency_ms - self.latency_ewma_ms)
+            self.served[tier] = self.served.get(tier, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': self.in_flight,
+                'latency_ewma_ms': self.latency_ewma_ms,
+                'served': dict(self.served),
+                'errors': dict(self.errors),
+                'rejected': self.rejected,
+                'max_in_flight': self.max_in_flight,
+                'degrade_in_flight': self.degrade_in_flight,
+                'latency_slo_ms': self.latency_slo_ms,
+            }
+
+
+_controller = None
+_controller_loaded = False
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """Return the process-wide controller, or None when admission control is disabled"""
+    global _controller, _controller_loaded
+
+    if _controller_loaded:
+        return _controller
+
+    with _controller_lock:
+        if not _controller_loaded:
+            config = {**DEFAULTS, **getattr(settings, 'ADMISSION_CONTROL', {})}
+            if config['ENABLED']:
+                _controller = AdmissionController(
+                    max_in_flight=config['MAX_IN_FLIGHT'],
+                    degrade_in_flight=config['DEGRADE_IN_FLIGHT'],
+                    latency_slo_ms=config['LATENCY_SLO_MS'],
+                    alpha=config['LATENCY_EWMA_ALPHA'],
+                    retry_after=config['RETRY_AFTER_SECONDS'],
+                    degraded_budget_ms=config['DEGRADED_BUDGET_MS'],
+                )
+                print(f"[Django] Admission control enabled (max in flight {config['MAX_IN_FLIGHT']})")
+            _controller_loaded = True
+    return _controller
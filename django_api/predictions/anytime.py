@@ -0,0 +1,98 @@
+"""
+Anytime prediction with early exit across the trees of a RandomForestClassifier.
+
+The forest's probability is the mean of its trees' probabilities. After k of n
+trees with partial sum S, the final value is bounded by [S / n, (S + n - k) / n],
+so once that interval falls inside a single survival_chance bucket and on one
+side of the 0.5 decision boundary, the remaining trees cannot change the
+outcome. Trees are evaluated in batches until the outcome is settled, all trees
+are used, or the latency budget runs out.
+"""
+import time
+
+import numpy as np
+
+from .features import model_feature_names
+
+
+DEFAULTS = {
+    'ENABLED': False,
+    'BATCH_SIZE': 16,           # trees evaluated between checks
+    'LATENCY_BUDGET_MS': None,  # stop after this many ms even if the outcome is not settled
+}
+
+LOW_THRESHOLD = 0.3
+HIGH_THRESHOLD = 0.6
+DECISION_THRESHOLD = 0.5
+
+
+def survival_chance(probability):
+    """Bucket shown to users: Low (< 0.3), Medium (< 0.6) or High"""
+    if probability < LOW_THRESHOLD:
+        return "Low"
+    elif probability < HIGH_THRESHOLD:
+        return "Medium"
+    return "High"
+
+
+def survived_from(probability):
+    # predict() takes the argmax of [p0, p1]; ties go to class 0
+    return probability > DECISION_THRESHOLD
+
+
+class AnytimeResult:
+    def __init__(self, probability, trees_used, trees_total, settled, exact):
+        self.probability = probability
+        self.survived = survived_from(probability)
+        self.survival_chance = survival_chance(probability)
+        self.trees_used = trees_used
+        self.trees_total = trees_total
+        self.settled = settled
+        self.exact = exact
+
+
+def anytime_predict(model, columns, feature_row, batch_size=16, budget_ms=None, exact=False):
+    """
+    Evaluate `model` (a fitted RandomForestClassifier) on one encoded feature row
+    whose values follow `columns`.
+
+    With exact=True every tree is used and the probability equals predict_proba.
+    Otherwise the probability is the mean over the trees used so far, and
+    `settled` tells whether survived/survival_chance are guaranteed to match
+    the full forest.
+    """
+    start = time.perf_counter()
+    # Trees are called with check_input=False, which skips sklearn's feature-name check
+    if list(columns) != model_feature_names(model):
+        raise ValueError("Feature row columns do not match the order the model was fitted on")
+    estimators = model.estimators_
+    n_trees = len(estimators)
+    positive = list(model.classes_).index(1)
+    X = np.asarray(feature_row, dtype=np.float32).reshape(1, -1)
+
+    total = 0.0
+    used = 0
+    settled = False
+    while used < n_trees:
+        for tree in estimators[used:used + batch_size]:
+            total += tree.predict_proba(X, check_input=False)[0, positive]
+        used = min(used + batch_size, n_trees)
+
+        if exact:
+            continue
+        low = total / n_trees
+        high = (total + n_trees - used) / n_trees
+        if survived_from(low) == survived_from(high) and survival_chance(low) == survival_chance(high):
+            settled = True
+            break
+        if budget_ms is not None and (time.perf_counter() - start) * 1000 >= budget_ms:
+            break
+
+    complete = used == n_trees
+    return AnytimeResult(
+        probability=float(total / used),
+        trees_used=used,
+        trees_total=n_trees,
+        settled=settled or complete,
+        exact=complete,
+    )
@@ -0,0 +1,180 @@
+"""
+Online input-distribution sketches for drift monitoring.
+
+Every prediction updates fixed-size histograms (Age, Fare, output probability)
+and category counters (Pclass, Sex, Embarked, Title, Deck) whose bins come from
+the baseline written by the training scripts (drift_baseline*.json). Counters
+are split into a fixed number of lock-striped shards picked by thread id, so
+the per-request cost is O(1), memory stays constant however many threads the
+server creates, and threaded workers rarely contend on the same lock. Shards
+are only merged when the drift report is requested.
+"""
+import json
+import math
+import threading
+from bisect import bisect_right
+
+
+# Population Stability Index thresholds commonly used for drift alerts
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+PSI_EPSILON = 1e-4
+
+# Lock-striped shards; more than the usual number of concurrent worker threads
+SHARDS = 16
+
+
+class _Shard:
+    """Counters for the threads whose id maps to this stripe"""
+
+    def __init__(self, numeric, categorical):
+        self.lock = threading.Lock()
+        self.count = 0
+        self.numeric = {name: [0] * (len(spec['edges']) + 1) for name, spec in numeric.items()}
+        self.categorical = {name: [0] * (len(spec['categories']) + 1) for name, spec in categorical.items()}
+
+
+def population_stability_index(expected, actual):
+    """PSI between two count vectors over the same bins"""
+    expected_total = sum(expected)
+    actual_total = sum(actual)
+    if expected_total == 0 or actual_total == 0:
+        return None
+    psi = 0.0
+    for e, a in zip(expected, actual):
+        e = max(e / expected_total, PSI_EPSILON)
+        a = max(a / actual_total, PSI_EPSILON)
+        psi += (a - e) * math.log(a / e)
+    return psi
+
+
+def drift_status(psi):
+    if psi is None:
+        return 'insufficient_data'
+    if psi < PSI_MODERATE:
+        return 'stable'
+    if psi < PSI_SIGNIFICANT:
+        return 'moderate'
+    return 'significant'
+
+
+class DriftMonitor:
+    """Live sketches compared against a training-time baseline"""
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self._numeric = baseline['numeric']
+        self._categorical = baseline['categorical']
+        self._category_index = {
+            name: {category: i for i, category in enumerate(spec['categories'])}
+            for name, spec in self._categorical.items()
+        }
+        self._shards = [_Shard(self._numeric, self._categorical) for _ in range(SHARDS)]
+
+    def observe(self, values):
+        """Record one request; `values` maps feature names (and 'Probability') to raw values"""
+        numeric_bins = {
+            name: bisect_right(spec['edges'], values[name])
+            for name, spec in self._numeric.items() if values.get(name) is not None
+        }
+        categorical_bins = {
+            name: index.get(str(values[name]), len(index))
+            for name, index in self._category_index.items() if values.get(name) is not None
+        }
+        # Native thread ids are small sequential integers, so they spread evenly over the stripes
+        shard = self._shards[threading.get_native_id() % SHARDS]
+        with shard.lock:
+            shard.count += 1
+            for name, i in numeric_bins.items():
+                shard.numeric[name][i] += 1
+            for name, i in categorical_bins.items():
+                shard.categorical[name][i] += 1
+
+    def _merged(self):
+        count = 0
+        numeric = {name: [0] * (len(spec['edges']) + 1) for name, spec in self._numeric.items()}
+        categorical = {name: [0] * (len(spec['categories']) + 1) for name, spec in self._categorical.items()}
+        for shard in self._shards:
+            with shard.lock:
+                count += shard.count
+                for name, counts in shard.numeric.items():
+                    numeric[name] = [a + b for a, b in zip(numeric[name], counts)]
+                for name, counts in shard.categorical.items():
+                    categorical[name] = [a + b for a, b in zip(categorical[name], counts)]
+        return count, numeric, categorical
+
+    def report(self):
+        count, numeric, categorical = self._merged()
+        features = {}
+        for name, spec in self._numeric.items():
+            psi = population_stability_index(spec['counts'], numeric[name])
+            features[name] = {
+                'type': 'histogram',
+                'psi': psi,
+                'status': drift_status(psi),
+                'edges': spec['edges'],
+                'baseline_counts': spec['counts'],
+                'live_counts': numeric[name],
+            }
+        for name, spec in self._categorical.items():
+            psi = population_stability_index(spec['counts'], categorical[name])
+            features[name] = {
+                'type': 'categorical',
+                'psi': psi,
+                'status': drift_status(psi),
+                'categories': spec['categories'] + ['other'],
+                'baseline_counts': spec['counts'],
+                'live_counts': categorical[name],
+            }
+        return {
+            'observations': count,
+            'baseline_rows': self.baseline.get('rows'),
+            'baseline_created_at': self.baseline.get('created_at'),
+            'baseline_model_file': self.baseline.get('model_file'),
+            'max_psi': max((f['psi'] for f in features.values() if f['psi'] is not None), default=None),
+            'features': features,
+        }
+
+
+def observed_values(data, columns, row, probability):
+    """Raw values tracked for drift, taken from validated input and the encoded feature row"""
+    title = next((col[len('Title_'):] for col, value in zip(columns, row)
+                  if col.startswith('Title_') and value), None)
+    deck = next((col[len('Deck_'):] for col, value in zip(columns, row)
+                 if col.startswith('Deck_') and value), None)
+    if deck is None and data.get('cabin'):
+        deck = data['cabin'][0]
+    return {
+        'Age': data['age'],
+        'Fare': data['fare'],
+        'Probability': probability,
+        'Pclass': data['pclass'],
+        'Sex': data['sex'],
+        'Embarked': data['embarked'],
+        'Title': title,
+        'Deck': deck,
+    }
+
+
+_monitor = None
+_monitor_loaded = False
+_monitor_lock = threading.Lock()
+
+
+def get_drift_monitor(baseline_path):
+    """Return the process-wide monitor, or None when no baseline has been generated"""
+    global _monitor, _monitor_loaded
+
+    if _monitor_loaded:
+        return _monitor
+
+    with _monitor_lock:
+        if not _monitor_loaded:
+            if baseline_path is not None and baseline_path.exists():
+                with open(baseline_path, 'r') as f:
+                    _monitor = DriftMonitor(json.load(f))
+                print(f"[Django] Drift baseline loaded from {baseline_path}")
+            else:
+                print("[Django] No drift baseline found, drift monitoring disabled")
+            _monitor_loaded = True
+    return _monitor
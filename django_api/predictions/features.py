@@ -0,0 +1,117 @@
+"""
+Featurization of one validated request in the training one-hot schema.
+
+The models are fitted on the columns produced by prepare_data in
+scripts/titanic_features.py (Sex_female/Sex_male, Age_Group_0-16, ... and no
+raw Age). This module builds the same features for a single passenger and
+lays them out in the order of the model's feature_names_in_, so every
+inference path (in-thread, anytime, process pool, shadow candidates, edge
+model) sees the columns it was trained on.
+"""
+import re
+
+import numpy as np
+
+
+TITLE_PATTERN = re.compile(r' ([A-Za-z]+)\.')
+COMMON_TITLES = ['Master', 'Miss', 'Mr', 'Mrs']
+RARE_TITLE = 'Rare'
+UNKNOWN_DECK = 'U'
+AGE_BINS = [0, 16, 30, 50, 100]
+AGE_LABELS = ['0-16', '17-30', '31-50', '51+']
+
+NUMERIC_FEATURES = ['Pclass', 'SibSp', 'Parch', 'Fare', 'FamilySize', 'IsAlone']
+ONE_HOT_FEATURES = {
+    'Sex': ['female', 'male'],
+    'Embarked': ['C', 'Q', 'S'],
+    'Title': COMMON_TITLES + [RARE_TITLE],
+    'Deck': ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'T', UNKNOWN_DECK],
+    'Age_Group': AGE_LABELS,
+}
+KNOWN_FEATURES = set(NUMERIC_FEATURES) | {
+    f'{prefix}_{value}' for prefix, values in ONE_HOT_FEATURES.items() for value in values
+}
+
+
+def title_of(data):
+    """Title from the name, or inferred from sex and age when no name is given"""
+    if data.get('name'):
+        match = TITLE_PATTERN.search(data['name'])
+        if match and match.group(1) in COMMON_TITLES:
+            return match.group(1)
+        return RARE_TITLE
+    if data['sex'] == 'male':
+        return 'Master' if data['age'] < 18 else 'Mr'
+    return 'Miss' if data['age'] < 18 else 'Mrs'
+
+
+def deck_of(data):
+    return data['cabin'][0] if data.get('cabin') else UNKNOWN_DECK
+
+
+def age_group(age):
+    """pd.cut(bins=AGE_BINS) label, or None outside (0, 100]"""
+    for i, label in enumerate(AGE_LABELS):
+        if AGE_BINS[i] < age <= AGE_BINS[i + 1]:
+            return label
+    return None
+
+
+def encode_passenger(pclass, sex, age, sibsp, parch, fare, embarked, title, deck):
+    """Non-zero training features of one passenger, as {feature name: value}"""
+    family_size = sibsp + parch + 1
+    features = {
+        'Pclass': pclass,
+        'SibSp': sibsp,
+        'Parch': parch,
+        'Fare': fare,
+        'FamilySize': family_size,
+        'IsAlone': int(family_size == 1),
+        f'Sex_{sex}': 1,
+        f'Embarked_{embarked}': 1,
+        f'Title_{title}': 1,
+    }
+    # Decks and ages the training data never saw leave every column of their group at 0
+    if deck is not None:
+        features[f'Deck_{deck}'] = 1
+    group = age_group(age)
+    if group is not None:
+        features[f'Age_Group_{group}'] = 1
+    return features
+
+
+def passenger_features(data):
+    """Non-zero training features of validated input"""
+    return encode_passenger(
+        data['pclass'], data['sex'], data['age'], data['sibsp'], data['parch'],
+        data['fare'], data['embarked'], title_of(data), deck_of(data),
+    )
+
+
+def vector_from(features, columns):
+    return np.array([features.get(column, 0.0) for column in columns], dtype=np.float64)
+
+
+def feature_vector(data, columns):
+    """Feature vector of validated input, in the order of `columns`"""
+    return vector_from(passenger_features(data), columns)
+
+
+def check_feature_names(names):
+    """Raise ValueError unless this module can build every column in `names`"""
+    unknown = [name for name in names if name not in KNOWN_FEATURES]
+    if unknown:
+        raise ValueError(f"The model expects features the API cannot build: {unknown}")
+
+
+def model_feature_names(model):
+    """The model's feature_names_in_, checked with check_feature_names"""
+    names = getattr(model, 'feature_names_in_', None)
+    if names is None:
+        raise ValueError(
+            "The model was fitted without feature names. Please retrain it with "
+            "scripts/02_train_model.py or scripts/03_optimize_model.py."
+        )
+    names = [str(name) for name in names]
+    check_feature_names(names)
+    return names
@@ -0,0 +1,356 @@
+"""
+Process-pool inference executor.
+
+Under threaded workers, featurization and tree traversal hold the GIL, so
+extra threads barely add throughput. This executor keeps a pool of long-lived
+worker processes that each load the model once. A request is encoded into a
+fixed row of numbers, written into a shared-memory slot, and only the slot
+index travels through the task queue; the worker expands the row into the
+model's feature vector, predicts, and writes the vector and result back into
+the same slot. Workers check at startup that the model's feature names match
+the columns the pool encodes, and the pool refuses to start otherwise.
+
+Each worker has its own pipe, so a worker that dies (OOM killer, segfault)
+cannot leave a shared queue lock held. The collector thread watches the pipes
+and the process sentinels; when a worker dies, the requests it held fail at
+once and a replacement is spawned. A pool left without live workers raises
+RuntimeError, and the view falls back to the in-thread path.
+"""
+import threading
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from queue import Queue, Empty
+
+import numpy as np
+
+from .features import (
+    ONE_HOT_FEATURES, check_feature_names, deck_of, encode_passenger, model_feature_names, title_of, vector_from,
+)
+
+
+DEFAULTS = {
+    'ENABLED': False,
+    'WORKERS': 2,
+    'SLOTS': 64,                # concurrent requests that can be in flight
+    'TIMEOUT': 5.0,             # seconds to wait for a free slot and for the result
+}
+
+EMBARKED = ONE_HOT_FEATURES['Embarked']
+TITLES = ONE_HOT_FEATURES['Title']
+DECKS = ONE_HOT_FEATURES['Deck']
+
+# Encoded request row: pclass, is_male, age, sibsp, parch, fare, embarked, title, deck
+REQUEST_WIDTH = 9
+# Result row: probability of survival, predicted class
+RESULT_WIDTH = 2
+# Slot index workers report on once they are ready (with an error if they are not)
+STARTUP_SLOT = -1
+STARTUP_TIMEOUT = 60.0
+
+
+class PoolSaturated(TimeoutError):
+    """No free slot within the timeout: the pool is overloaded, not broken"""
+
+
+def encode_request(data):
+    """Encode validated input into a request row (title and deck resolved as in features.py)"""
+    deck = deck_of(data)
+    return np.array([
+        data['pclass'],
+        1.0 if data['sex'] == 'male' else 0.0,
+        data['age'],
+        data['sibsp'],
+        data['parch'],
+        data['fare'],
+        EMBARKED.index(data['embarked']),
+        TITLES.index(title_of(data)),
+        DECKS.index(deck) if deck in DECKS else -1,
+    ], dtype=np.float64)
+
+
+def expand_request(row, columns):
+    """Build the model's feature vector, in the order of `columns`, from an encoded request row"""
+    pclass, is_male, age, sibsp, parch, fare, embarked, title, deck = row
+    features = encode_passenger(
+        pclass, 'male' if is_male else 'female', age, sibsp, parch, fare,
+        EMBARKED[int(embarked)], TITLES[int(title)], DECKS[int(deck)] if deck >= 0 else None,
+    )
+    return vector_from(features, columns)
+
+
+def _slot_arrays(shm, slots, n_features):
+    """Views over the shared block: requests, feature vectors and results per slot"""
+    requests = np.ndarray((slots, REQUEST_WIDTH), dtype=np.float64, buffer=shm.buf)
+    offset = requests.nbytes
+    vectors = np.ndarray((slots, n_features), dtype=np.float64, buffer=shm.buf, offset=offset)
+    offset += vectors.nbytes
+    results = np.ndarray((slots, RESULT_WIDTH), dtype=np.float64, buffer=shm.buf, offset=offset)
+    return requests, vectors, results
+
+
+def _worker_main(model_path, columns, shm_name, slots, conn):
+    """Worker process: load the model once, then serve slot indices until told to stop"""
+    import joblib
+    import pandas as pd
+
+    try:
+        model = joblib.load(model_path)
+        names = model_feature_names(model)
+        if names != list(columns):
+            raise ValueError(f"Model features {names} do not match the pool columns {list(columns)}")
+    except Exception as e:
+        conn.send((STARTUP_SLOT, str(e)))
+        return
+    conn.send((STARTUP_SLOT, None))
+
+    shm = SharedMemory(name=shm_name)
+    requests, vectors, results = _slot_arrays(shm, slots, len(columns))
+    try:
+        while True:
+            try:
+                slot = conn.recv()
+            except EOFError:
+                # The web worker went away without closing the pool
+                break
+            if slot is None:
+                break
+            try:
+                vectors[slot] = expand_request(requests[slot], columns)
+                features = pd.DataFrame(vectors[slot].reshape(1, -1), columns=columns)
+                probability = model.predict_proba(features)[0]
+                results[slot, 0] = probability[1]
+                results[slot, 1] = model.classes_[int(np.argmax(probability))]
+                conn.send((slot, None))
+            except Exception as e:
+                conn.send((slot, str(e)))
+    finally:
+        del requests, vectors, results
+        shm.close()
+
+
+class _Worker:
+    """One worker process, the parent's end of its pipe and the slots it holds"""
+
+    def __init__(self, context, args):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(*args, child), daemon=True)
+        self.process.start()
+        child.close()
+        self.ready = False
+        self.slots = set()
+        self.send_lock = threading.Lock()
+
+
+class InferencePool:
+    """Dispatches featurize+predict to long-lived worker processes through shared memory"""
+
+    def __init__(self, model_path, columns, workers, slots, timeout):
+        self.columns = list(columns)
+        # Fail before spawning anything if the columns are not the training schema
+        check_feature_names(self.columns)
+        self.slots = slots
+        self.timeout = timeout
+
+        n_features = len(self.columns)
+        size = slots * (REQUEST_WIDTH + n_features + RESULT_WIDTH) * np.dtype(np.float64).itemsize
+        self._shm = SharedMemory(create=True, size=size)
+        self._requests, self._vectors, self._results = _slot_arrays(self._shm, slots, n_features)
+
+        # spawn: forking a threaded web worker is unsafe
+        self._context = get_context('spawn')
+        self._worker_args = (str(model_path), self.columns, self._shm.name, slots)
+        self._workers = [_Worker(self._context, self._worker_args) for _ in range(workers)]
+        self._await_workers()
+
+        self._free = Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+        self._events = [threading.Event() for _ in range(slots)]
+        self._errors = [None] * slots
+        # Slots whose request timed out; returned to the free list once the worker answers
+        self._abandoned = set()
+        self._lock = threading.Lock()
+        self._wakeup, self._wakeup_sender = self._context.Pipe(duplex=False)
+        self._collector = threading.Thread(target=self._collect, name='inference-pool-collector', daemon=True)
+        self._collector.start()
+
+    def _await_workers(self):
+        """Wait until every worker has loaded the model and checked its feature names"""
+        errors = []
+        for worker in self._workers:
+            try:
+                if not worker.conn.poll(STARTUP_TIMEOUT):
+                    errors.append("Inference pool workers did not start in time")
+                    break
+                slot, error = worker.conn.recv()
+            except EOFError:
+                errors.append(f"Inference pool worker exited with code {worker.process.exitcode}")
+                break
+            if error is not None:
+                errors.append(error)
+            worker.ready = True
+        if errors:
+            self._shutdown()
+            raise RuntimeError(errors[0])
+
+    def _collect(self):
+        while True:
+            with self._lock:
+                workers = list(self._workers)
+            waitables = {self._wakeup: None}
+            for worker in workers:
+                waitables[worker.conn] = worker
+                waitables[worker.process.sentinel] = worker
+            ready = wait(list(waitables))
+            if self._wakeup in ready:
+                return
+            dead = []
+            for handle in ready:
+                worker = waitables[handle]
+                if worker in dead or (handle is worker.conn and self._receive(worker)):
+                    continue
+                dead.append(worker)
+            for worker in dead:
+                self._replace(worker)
+
+    def _receive(self, worker):
+        """Handle every message waiting on the worker's pipe; False once the pipe is closed"""
+        try:
+            while worker.conn.poll():
+                slot, error = worker.conn.recv()
+                if slot == STARTUP_SLOT:
+                    if error is not None:
+                        print(f"[Django] Inference pool worker failed to restart: {error}")
+                        return False
+                    worker.ready = True
+                else:
+                    self._finish(worker, slot, error)
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def _finish(self, worker, slot, error):
+        with self._lock:
+            worker.slots.discard(slot)
+            self._errors[slot] = error
+            self._events[slot].set()
+            if slot in self._abandoned:
+                self._abandoned.remove(slot)
+                self._free.put(slot)
+
+    def _replace(self, worker):
+        """Fail the requests a dead worker held and, if it had started, spawn a replacement"""
+        # Results it sent before dying are still valid
+        self._receive(worker)
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            # Its pipe broke but the process hangs on; don't leave it holding the model
+            worker.process.kill()
+            worker.process.join()
+        with self._lock:
+            if worker not in self._workers:
+                return
+            self._workers.remove(worker)
+        for slot in list(worker.slots):
+            self._finish(worker, slot, f"Inference pool worker died (exit code {worker.process.exitcode})")
+        worker.conn.close()
+        if not worker.ready:
+            # It could not load the model; respawning would only fail again
+            return
+        print(f"[Django] Inference pool worker died (exit code {worker.process.exitcode}), restarting it")
+        replacement = _Worker(self._context, self._worker_args)
+        with self._lock:
+            self._workers.append(replacement)
+
+    def _dispatch(self, slot):
+        """Hand the slot to the ready worker holding the fewest requests"""
+        with self._lock:
+            ready = [worker for worker in self._workers if worker.ready]
+            if not ready:
+                if not self._workers:
+                    raise RuntimeError("Inference pool has no live workers")
+                raise RuntimeError("Inference pool workers are restarting")
+            worker = min(ready, key=lambda w: len(w.slots))
+            worker.slots.add(slot)
+        try:
+            with worker.send_lock:
+                worker.conn.send(slot)
+        except OSError:
+            # The worker is dead; the collector fails this slot when it replaces it
+            pass
+
+    def predict(self, data):
+        """Return (probability of survival, predicted class, feature vector) for validated input"""
+        try:
+            slot = self._free.get(timeout=self.timeout)
+        except Empty:
+            raise PoolSaturated("Inference pool is saturated")
+        try:
+            self._requests[slot] = encode_request(data)
+            self._events[slot].clear()
+            self._dispatch(slot)
+            if not self._events[slot].wait(self.timeout):
+                with self._lock:
+                    if not self._events[slot].is_set():
+                        # The worker may still write into this slot; the collector frees it later
+                        self._abandoned.add(slot)
+                        slot = None
+                if slot is None:
+                    raise TimeoutError("Inference pool worker did not answer in time")
+            if self._errors[slot] is not None:
+                raise RuntimeError(self._errors[slot])
+            return float(self._results[slot, 0]), int(self._results[slot, 1]), self._vectors[slot].copy()
+        finally:
+            if slot is not None:
+                self._free.put(slot)
+
+    def close(self):
+        self._wakeup_sender.send(None)
+        self._collector.join(timeout=5)
+        self._shutdown()
+
+    def _shutdown(self):
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            worker.conn.close()
+        del self._requests, self._vectors, self._results
+        self._shm.close()
+        self._shm.unlink()
+
+
+_pool = None
+_pool_loaded = False
+_pool_lock = threading.Lock()
+
+
+def get_inference_pool(model_path, columns):
+    """Return the process-wide pool, or None when the in-thread path should be used"""
+    global _pool, _pool_loaded
+
+    if _pool_loaded:
+        return _pool
+
+    with _pool_lock:
+        if not _pool_loaded:
+            from django.conf import settings
+
+            config = {**DEFAULTS, **getattr(settings, 'INFERENCE_POOL', {})}
+            if config['ENABLED']:
+                import atexit
+
+                try:
+                    _pool = InferencePool(model_path, columns, config['WORKERS'], config['SLOTS'], config['TIMEOUT'])
+                except (RuntimeError, ValueError) as e:
+                    # Predictions stay on the in-thread path
+                    print(f"[Django] Inference pool not started: {e}")
+                else:
+                    atexit.register(_pool.close)
+                    print(f"[Django] Inference pool started with {config['WORKERS']} worker processes")
+            _pool_loaded = True
+    return _pool
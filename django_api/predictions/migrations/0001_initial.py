@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('input_data', models.JSONField()),
+                ('survived', models.BooleanField()),
+                ('probability', models.FloatField()),
+                ('survival_chance', models.CharField(max_length=16)),
+                ('model_type', models.CharField(max_length=100)),
+                ('model_version', models.CharField(max_length=100, db_index=True)),
+                ('latency_ms', models.FloatField()),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,3 +1,19 @@
 from django.db import models
 
-# Create your models here.
+
+class PredictionLog(models.Model):
+    """Record of a scored request, written in batches by the write-behind log"""
+    created_at = models.DateTimeField(db_index=True)
+    input_data = models.JSONField()
+    survived = models.BooleanField()
+    probability = models.FloatField()
+    survival_chance = models.CharField(max_length=16)
+    model_type = models.CharField(max_length=100)
+    model_version = models.CharField(max_length=100, db_index=True)
+    latency_ms = models.FloatField()
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M:%S} {self.model_version} p={self.probability:.3f}"
@@ -0,0 +1,155 @@
+"""
+Write-behind prediction log.
+
+Requests only append a record to a bounded in-memory buffer; a background
+thread flushes the buffer to SQLite with bulk inserts in a single transaction
+whenever BATCH_SIZE records are pending or FLUSH_INTERVAL seconds have passed.
+When the buffer is full the DROP_POLICY decides what is lost ('drop_newest'
+rejects the incoming record, 'drop_oldest' evicts the oldest pending one), so
+the request path never blocks on the database.
+"""
+import atexit
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_QUEUE': 10000,
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL': 2.0,
+    'DROP_POLICY': 'drop_newest',
+    'SHUTDOWN_TIMEOUT': 10.0,
+}
+
+DROP_POLICIES = ('drop_newest', 'drop_oldest')
+
+
+class PredictionLogWriter:
+    """Buffers prediction records and writes them to the database in batches"""
+
+    def __init__(self, max_queue, batch_size, flush_interval, drop_policy, shutdown_timeout):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown prediction log drop policy: {drop_policy}")
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.shutdown_timeout = shutdown_timeout
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, record):
+        """Queue a record without blocking. Returns False if a record was dropped."""
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            accepted = True
+            if len(self._buffer) >= self.max_queue:
+                self.dropped += 1
+                accepted = False
+                if self.drop_policy == 'drop_newest':
+                    return False
+                self._buffer.popleft()
+            record.setdefault('created_at', timezone.now())
+            self._buffer.append(record)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='prediction-log-writer', daemon=True)
+                self._thread.start()
+        return accepted
+
+    def _take_batch(self):
+        count = min(len(self._buffer), self.batch_size)
+        return [self._buffer.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._buffer) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                batch = self._take_batch()
+                done = self._closed and not self._buffer
+            if batch:
+                self._write(batch)
+            if done:
+                close_old_connections()
+                return
+
+    def _write(self, batch):
+        from .models import PredictionLog
+
+        close_old_connections()
+        try:
+            with transaction.atomic():
+                PredictionLog.objects.bulk_create(
+                    [PredictionLog(**record) for record in batch], batch_size=self.batch_size)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"[Django] Prediction log flush failed ({len(batch)} records lost): {e}")
+
+    def close(self):
+        """Flush everything still buffered and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(self.shutdown_timeout)
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._buffer)
+        return {
+            'pending': pending,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'max_queue': self.max_queue,
+            'drop_policy': self.drop_policy,
+        }
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_prediction_log():
+    """Return the process-wide writer, or None when logging is disabled"""
+    global _writer
+
+    if _writer is not None:
+        return _writer
+
+    config = {**DEFAULTS, **getattr(settings, 'PREDICTION_LOG', {})}
+    if not config['ENABLED']:
+        return None
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = PredictionLogWriter(
+                max_queue=config['MAX_QUEUE'],
+                batch_size=config['BATCH_SIZE'],
+                flush_interval=config['FLUSH_INTERVAL'],
+                drop_policy=config['DROP_POLICY'],
+                shutdown_timeout=config['SHUTDOWN_TIMEOUT'],
+            )
+            atexit.register(_writer.close)
+    return _writer
@@ -13,6 +13,7 @@ class PredictionInputSerializer(serializers.Serializer):
     name = serializers.CharField(required=False, allow_blank=True)
     ticket = serializers.CharField(required=False, allow_blank=True)
     cabin = serializers.CharField(required=False, allow_blank=True)
+    exact_probability = serializers.BooleanField(required=False, default=False)
 
     def validate(self, data):
         """Additional validation"""
@@ -30,4 +31,8 @@ class PredictionOutputSerializer(serializers.Serializer):
     survival_chance = serializers.CharField()
     model_type = serializers.CharField()
     model_accuracy = serializers.FloatField()
+    model_tier = serializers.CharField(required=False)
     features_used = serializers.ListField(child=serializers.CharField())
+    trees_used = serializers.IntegerField(required=False)
+    trees_total = serializers.IntegerField(required=False)
+    probability_exact = serializers.BooleanField(required=False)
@@ -0,0 +1,237 @@
+"""
+Shadow scoring of candidate models off the request path.
+
+predict_survival keeps answering from the primary model and hands the
+validated input to a background executor (threads or processes), where each
+candidate model is loaded once (per process with the process executor) and scored on a vector encoded with
+its own feature names. Agreement rates, probability deltas and per-model
+latency are aggregated for /api/shadow/. Submission never blocks: once
+MAX_QUEUE requests are in flight new ones are shed and counted. If the
+executor breaks (e.g. a candidate fails to load), shadow scoring disables
+itself instead of failing the primary response.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .anytime import survival_chance, survived_from
+from .features import model_feature_names, passenger_features, vector_from
+
+
+DEFAULTS = {
+    'ENABLED': False,
+    'CANDIDATES': [],           # model files, relative to the project root
+    'EXECUTOR': 'thread',       # 'thread' or 'process' (keeps candidate scoring off the GIL)
+    'WORKERS': 1,
+    'MAX_QUEUE': 1000,
+}
+
+LATENCY_WINDOW = 1000
+
+
+# Candidate models of a shadow worker process, loaded by _load_candidates
+_candidates = None
+
+
+def _read_candidates(paths):
+    """[(name, model, feature names)] for the candidate model files"""
+    candidates = []
+    for path in paths:
+        model = joblib.load(path)
+        candidates.append((Path(path).stem, model, model_feature_names(model)))
+    return candidates
+
+
+def _load_candidates(paths):
+    """Process executor initializer: load the candidates once per worker process"""
+    global _candidates
+    _candidates = _read_candidates(paths)
+
+
+def _score_candidates(data, candidates=None):
+    """Runs in the worker: score every candidate on one validated request"""
+    if candidates is None:
+        candidates = _candidates
+    values = passenger_features(data)
+    results = []
+    for name, model, columns in candidates:
+        start = time.perf_counter()
+        features = pd.DataFrame([vector_from(values, columns)], columns=columns)
+        probability = float(model.predict_proba(features)[0][1])
+        results.append((name, probability, (time.perf_counter() - start) * 1000))
+    return results
+
+
+class _ModelStats:
+    def __init__(self):
+        self.scored = 0
+        self.agree = 0
+        self.bucket_agree = 0
+        self.delta_sum = 0.0
+        self.abs_delta_sum = 0.0
+        self.max_abs_delta = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def add(self, probability, latency_ms, primary_probability, primary_survived):
+        delta = probability - primary_probability
+        self.scored += 1
+        self.agree += int(survived_from(probability) == primary_survived)
+        self.bucket_agree += int(survival_chance(probability) == survival_chance(primary_probability))
+        self.delta_sum += delta
+        self.abs_delta_sum += abs(delta)
+        self.max_abs_delta = max(self.max_abs_delta, abs(delta))
+        self.latencies.append(latency_ms)
+
+    def summary(self):
+        latencies = np.array(self.latencies) if self.latencies else None
+        return {
+            'scored': self.scored,
+            'agreement_rate': self.agree / self.scored if self.scored else None,
+            'bucket_agreement_rate': self.bucket_agree / self.scored if self.scored else None,
+            'mean_delta': self.delta_sum / self.scored if self.scored else None,
+            'mean_abs_delta': self.abs_delta_sum / self.scored if self.scored else None,
+            'max_abs_delta': self.max_abs_delta,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies, 50)),
+                'p95': float(np.percentile(latencies, 95)),
+                'p99': float(np.percentile(latencies, 99)),
+            } if latencies is not None else None,
+        }
+
+
+class ShadowScorer:
+    """Queues feature vectors to candidate models and aggregates how they compare"""
+
+    def __init__(self, candidate_paths, executor, workers, max_queue):
+        self.candidate_paths = [str(path) for path in candidate_paths]
+        self.max_queue = max_queue
+
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self.submitted = 0
+        self.shed = 0
+        self.errors = 0
+        # Set to the reason once the executor is unusable; submissions are then ignored
+        self.disabled = None
+        self._primary_latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stats = {}
+
+        # Threads share one copy of the candidates; processes each load their own
+        self._candidates = None
+        if executor == 'process':
+            # spawn: forking a threaded web worker is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=get_context('spawn'),
+                initializer=_load_candidates, initargs=(self.candidate_paths,))
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+            try:
+                self._candidates = _read_candidates(self.candidate_paths)
+            except Exception as e:
+                self._disable(e)
+
+    def submit(self, data, primary_probability, primary_survived, primary_latency_ms):
+        """Hand validated input to the shadow workers; returns False if it was shed or not scored"""
+        with self._lock:
+            if self.disabled is not None:
+                return False
+            self._primary_latencies.append(primary_latency_ms)
+            if self._inflight >= self.max_queue:
+                self.shed += 1
+                return False
+            self._inflight += 1
+            self.submitted += 1
+
+        try:
+            future = self._executor.submit(_score_candidates, dict(data), self._candidates)
+        except Exception as e:
+            with self._lock:
+                self._inflight -= 1
+                self.errors += 1
+            self._disable(e)
+            return False
+        future.add_done_callback(
+            lambda f: self._collect(f, primary_probability, primary_survived))
+        return True
+
+    def _disable(self, error):
+        with self._lock:
+            if self.disabled is not None:
+                return
+            self.disabled = str(error) or type(error).__name__
+        # A broken executor has already stopped its workers; shutting it down from a
+        # done callback would deadlock on the executor's own lock
+        print(f"[Django] Shadow scoring disabled: {self.disabled}")
+
+    def _collect(self, future, primary_probability, primary_survived):
+        try:
+            results = future.result()
+        except Exception as e:
+            with self._lock:
+                self._inflight -= 1
+                self.errors += 1
+                first_error = self.errors == 1
+            if isinstance(e, BrokenExecutor):
+                self._disable(e)
+            elif first_error:
+                print(f"[Django] Shadow scoring failed: {e}")
+            return
+        with self._lock:
+            self._inflight -= 1
+            for name, probability, latency_ms in results:
+                stats = self._stats.setdefault(name, _ModelStats())
+                stats.add(probability, latency_ms, primary_probability, primary_survived)
+
+    def report(self):
+        with self._lock:
+            primary = np.array(self._primary_latencies) if self._primary_latencies else None
+            return {
+                'candidates': self.candidate_paths,
+                'submitted': self.submitted,
+                'shed': self.shed,
+                'errors': self.errors,
+                'disabled': self.disabled,
+                'in_flight': self._inflight,
+                'max_queue': self.max_queue,
+                'primary_latency_ms': {
+                    'p50': float(np.percentile(primary, 50)),
+                    'p95': float(np.percentile(primary, 95)),
+                    'p99': float(np.percentile(primary, 99)),
+                } if primary is not None else None,
+                'models': {name: stats.summary() for name, stats in self._stats.items()},
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_scorer = None
+_scorer_loaded = False
+_scorer_lock = threading.Lock()
+
+
+def get_shadow_scorer():
+    """Return the process-wide shadow scorer, or None when shadow mode is disabled"""
+    global _scorer, _scorer_loaded
+
+    if _scorer_loaded:
+        return _scorer
+
+    with _scorer_lock:
+        if not _scorer_loaded:
+            config = {**DEFAULTS, **getattr(settings, 'SHADOW_SCORING', {})}
+            if config['ENABLED'] and config['CANDIDATES']:
+                base_dir = Path(__file__).resolve().parent.parent.parent
+                paths = [base_dir / path for path in config['CANDIDATES']]
+                _scorer = ShadowScorer(paths, config['EXECUTOR'], config['WORKERS'], config['MAX_QUEUE'])
+                print(f"[Django] Shadow scoring enabled for {[p.name for p in paths]}")
+            _scorer_loaded = True
+    return _scorer
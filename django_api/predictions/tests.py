@@ -0,0 +1,73 @@
+import math
+
+from django.test import SimpleTestCase
+
+from predictions.admission import PRIMARY, AdmissionController
+from predictions.shadow import _ModelStats
+from predictions.views import edge_probability
+
+
+EDGE_ARTIFACT = {
+    'intercept': 0.5,
+    'coefficients': {'SibSp': -0.6, 'Parch': 0.4, 'FamilySize': -0.2, 'Sex_male': -1.2, 'Title_Mr': -1.5},
+}
+
+
+def passenger(**overrides):
+    data = {
+        'pclass': 3, 'sex': 'male', 'age': 30.0, 'sibsp': 0, 'parch': 0,
+        'fare': 8.05, 'embarked': 'S', 'name': 'Allen, Mr. William Henry', 'cabin': '',
+    }
+    data.update(overrides)
+    return data
+
+
+class EdgeProbabilityTests(SimpleTestCase):
+    def test_large_counts_do_not_overflow(self):
+        # sibsp/parch have no upper bound in the serializer
+        for overrides in ({'sibsp': 5000}, {'parch': 3000}, {'sibsp': 10 ** 6, 'parch': 10 ** 6}):
+            probability = edge_probability(EDGE_ARTIFACT, passenger(**overrides))
+            self.assertGreaterEqual(probability, 0.0)
+            self.assertLessEqual(probability, 1.0)
+
+    def test_extreme_logits_saturate(self):
+        self.assertEqual(edge_probability(EDGE_ARTIFACT, passenger(sibsp=5000)), 0.0)
+        self.assertEqual(edge_probability(EDGE_ARTIFACT, passenger(parch=10 ** 6)), 1.0)
+
+    def test_matches_plain_sigmoid_for_ordinary_input(self):
+        # intercept 0.5 - Sex_male 1.2 - Title_Mr 1.5 - FamilySize 0.2
+        self.assertAlmostEqual(edge_probability(EDGE_ARTIFACT, passenger()), 1 / (1 + math.exp(2.4)))
+
+
+class AdmissionControllerTests(SimpleTestCase):
+    def controller(self):
+        return AdmissionController(max_in_flight=4, degrade_in_flight=2, latency_slo_ms=200.0,
+                                   alpha=0.5, retry_after=1, degraded_budget_ms=10.0)
+
+    def test_failures_are_counted_as_errors(self):
+        controller = self.controller()
+        self.assertEqual(controller.acquire(), PRIMARY)
+        controller.release('primary', 5000.0, succeeded=False)
+        stats = controller.stats()
+        self.assertEqual(stats['served'], {})
+        self.assertEqual(stats['errors'], {'primary': 1})
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_failures_stay_out_of_the_latency_average(self):
+        controller = self.controller()
+        controller.acquire()
+        controller.release('primary', 100.0, succeeded=True)
+        controller.acquire()
+        controller.release('primary', 5000.0, succeeded=False)
+        self.assertEqual(controller.latency_ewma_ms, 50.0)
+        # A pool timeout must not push the next request into the degraded tier
+        self.assertEqual(controller.acquire(), PRIMARY)
+
+
+class ShadowAgreementTests(SimpleTestCase):
+    def test_ties_count_as_not_survived_like_predict(self):
+        # predict() takes the argmax of [p0, p1], so 0.5 is "did not survive"
+        stats = _ModelStats()
+        stats.add(0.5, 1.0, primary_probability=0.4, primary_survived=False)
+        stats.add(0.5, 1.0, primary_probability=0.6, primary_survived=True)
+        self.assertEqual(stats.agree, 1)
@@ -2,24 +2,38 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 from .serializers import PredictionInputSerializer, PredictionOutputSerializer
+from .prediction_log import get_prediction_log
+from .drift import get_drift_monitor, observed_values
+from .shadow import get_shadow_scorer
+from .inference_pool import PoolSaturated, get_inference_pool
+from .anytime import anytime_predict, survival_chance as survival_chance_for, DEFAULTS as ANYTIME_DEFAULTS
+from .admission import get_admission_controller, DEGRADED
+from .features import feature_vector, model_feature_names, passenger_features
+from django.conf import settings
 import joblib
 import pandas as pd
 import numpy as np
+import math
 import os
+import time
 from pathlib import Path
 
 
 # Global variable to store loaded model
 _model = None
 _model_metadata = None
+_model_info = None
+
+# Cached edge model artifact: (mtime, data)
+_edge_model = None
 
 
 def load_model():
     """Load the trained model (optimized or basic)"""
-    global _model, _model_metadata
+    global _model, _model_metadata, _model_info
     
     if _model is not None:
-        return _model, _model_metadata
+        return _model, _model_info
     
     # Get the project root directory (parent of django_api)
     base_dir = Path(__file__).resolve().parent.parent.parent
@@ -31,6 +45,8 @@ def load_model():
     if optimized_model_path.exists():
         print(f"[Django] Loading OPTIMIZED model from {optimized_model_path}")
         _model = joblib.load(optimized_model_path)
+        model_path = optimized_model_path
+        baseline_path = base_dir / 'drift_baseline_optimized.json'
         
         # Try to load metadata
         metadata_path = base_dir / 'model_metadata_optimized.json'
@@ -45,6 +61,8 @@ def load_model():
     elif basic_model_path.exists():
         print(f"[Django] Loading BASIC model from {basic_model_path}")
         _model = joblib.load(basic_model_path)
+        model_path = basic_model_path
+        baseline_path = base_dir / 'drift_baseline.json'
         model_type = "Random Forest (Basic)"
         accuracy = 0.82
         
@@ -54,102 +72,40 @@ def load_model():
             "scripts/03_optimize_model.py first."
         )
     
+    try:
+        # Refuse to serve a model whose columns the API cannot reproduce
+        features = model_feature_names(_model)
+    except ValueError:
+        _model = None
+        raise
+    
     print(f"[Django] Model loaded successfully: {model_type}")
     print(f"[Django] Model accuracy: {accuracy:.2%}")
     
-    return _model, {
+    _model_info = {
         'model_type': model_type,
-        'accuracy': accuracy
+        'accuracy': accuracy,
+        # File name plus modification time identifies the exact artifact that scored a request
+        'model_version': f"{model_path.stem}@{int(model_path.stat().st_mtime)}",
+        # Columns in the order the model was fitted on (training one-hot schema)
+        'features': features,
+        'model_path': model_path,
+        'drift_baseline_path': baseline_path,
     }
+    return _model, _model_info
 
 
-def prepare_features(data):
-    """Prepare features for prediction (same as training script)"""
-    df = pd.DataFrame([data])
-    
-    # Extract Title from Name if provided
-    if 'name' in data and data['name']:
-        df['Title'] = df['name'].str.extract(' ([A-Za-z]+)\.', expand=False)
-        title_mapping = {
-            'Mr': 'Mr', 'Miss': 'Miss', 'Mrs': 'Mrs', 'Master': 'Master'
-        }
-        df['Title'] = df['Title'].map(title_mapping).fillna('Rare')
-    else:
-        # Infer title from sex and age
-        if data['sex'] == 'male':
-            df['Title'] = 'Master' if data['age'] < 18 else 'Mr'
-        else:
-            df['Title'] = 'Miss' if data['age'] < 18 else 'Mrs'
-    
-    # Extract Deck from Cabin if provided
-    if 'cabin' in data and data['cabin']:
-        df['Deck'] = df['cabin'].str[0]
-    else:
-        df['Deck'] = 'U'  # Unknown
-    
-    # Create Age_Group
-    if data['age'] <= 16:
-        df['Age_Group'] = 'Child'
-    elif data['age'] <= 30:
-        df['Age_Group'] = 'Young_Adult'
-    elif data['age'] <= 50:
-        df['Age_Group'] = 'Adult'
-    else:
-        df['Age_Group'] = 'Senior'
-    
-    # Create FamilySize
-    df['FamilySize'] = data['sibsp'] + data['parch'] + 1
-    
-    # Create IsAlone
-    df['IsAlone'] = (df['FamilySize'] == 1).astype(int)
-    
-    # Convert Sex to numeric
-    df['Sex'] = (data['sex'] == 'male').astype(int)
-    
-    # Select features for model
-    features = pd.DataFrame({
-        'Pclass': [data['pclass']],
-        'Sex': [df['Sex'].iloc[0]],
-        'Age': [data['age']],
-        'SibSp': [data['sibsp']],
-        'Parch': [data['parch']],
-        'Fare': [data['fare']],
-        'FamilySize': [df['FamilySize'].iloc[0]],
-        'IsAlone': [df['IsAlone'].iloc[0]],
-    })
-    
-    # One-hot encode categorical features
-    embarked_dummies = pd.get_dummies(pd.Series([data['embarked']]), prefix='Embarked')
-    title_dummies = pd.get_dummies(df['Title'], prefix='Title')
-    deck_dummies = pd.get_dummies(df['Deck'], prefix='Deck')
-    age_group_dummies = pd.get_dummies(df['Age_Group'], prefix='Age_Group')
-    
-    # Combine all features
-    features = pd.concat([
-        features.reset_index(drop=True),
-        embarked_dummies.reset_index(drop=True),
-        title_dummies.reset_index(drop=True),
-        deck_dummies.reset_index(drop=True),
-        age_group_dummies.reset_index(drop=True)
-    ], axis=1)
-    
-    # Ensure all expected columns are present (model was trained with specific columns)
-    expected_columns = [
-        'Pclass', 'Sex', 'Age', 'SibSp', 'Parch', 'Fare', 'FamilySize', 'IsAlone',
-        'Embarked_C', 'Embarked_Q', 'Embarked_S',
-        'Title_Master', 'Title_Miss', 'Title_Mr', 'Title_Mrs', 'Title_Rare',
-        'Deck_A', 'Deck_B', 'Deck_C', 'Deck_D', 'Deck_E', 'Deck_F', 'Deck_G', 'Deck_T', 'Deck_U',
-        'Age_Group_Adult', 'Age_Group_Child', 'Age_Group_Senior', 'Age_Group_Young_Adult'
-    ]
-    
-    for col in expected_columns:
-        if col not in features.columns:
-            features[col] = 0
-    
-    # Reorder columns to match training
-    features = features[expected_columns]
-    
-    return features
+def prepare_features(data, columns):
+    """Prepare features for prediction (same one-hot schema as the training scripts)"""
+    return pd.DataFrame([feature_vector(data, columns)], columns=columns)
+
+
+def predict_in_thread(model, data, columns):
+    """Featurize and predict in the request thread: (probability, predicted class, feature vector)"""
+    features = prepare_features(data, columns)
+    prediction = model.predict(features)[0]
+    probability = model.predict_proba(features)[0]
+    return float(probability[1]), prediction, features.to_numpy(dtype=float)[0]
 
 
 @api_view(['GET'])
@@ -180,38 +136,134 @@ def predict_survival(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    start_time = time.perf_counter()
+    
+    # Shed load before doing any work once too many predictions are in flight
+    admission = get_admission_controller()
+    admitted = None
+    if admission is not None:
+        admitted = admission.acquire()
+        if admitted is None:
+            return Response({
+                'error': 'Server overloaded.',
+                'message': f'Too many predictions in progress, retry in {admission.retry_after}s.',
+                'retry_after': admission.retry_after,
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(admission.retry_after)})
+    
+    tier = 'primary'
+    succeeded = False
     try:
         # Load model
         model, metadata = load_model()
+        model_type = metadata['model_type']
+        model_accuracy = metadata['accuracy']
+        model_version = metadata['model_version']
+        features_used = metadata['features']
         
-        # Prepare features
-        features = prepare_features(serializer.validated_data)
+        edge_artifact = None
+        if admitted == DEGRADED:
+            try:
+                edge_artifact = load_edge_model()
+            except FileNotFoundError:
+                pass
         
-        # Make prediction
-        prediction = model.predict(features)[0]
-        probability = model.predict_proba(features)[0]
+        anytime = None
+        anytime_config = {**ANYTIME_DEFAULTS, **getattr(settings, 'ANYTIME_PREDICTION', {})}
+        inference_start = time.perf_counter()
+        inference_pool = get_inference_pool(metadata['model_path'], metadata['features'])
+        if edge_artifact is not None:
+            # Degraded tier: a handful of multiply-adds instead of the forest
+            tier = 'edge'
+            survival_prob = edge_probability(edge_artifact, serializer.validated_data)
+            prediction = survival_prob > edge_artifact['encoding']['threshold']
+            feature_row = None
+            model_type = f"Logistic Regression (edge {edge_artifact['version']})"
+            model_accuracy = edge_artifact['metrics']['val_score']
+            model_version = f"edge_model@{edge_artifact['version']}"
+            features_used = edge_artifact['features']
+        elif admitted == DEGRADED and hasattr(model, 'estimators_'):
+            # Degraded tier without an edge model: forest with a tight latency budget
+            tier = 'early_exit'
+            features = prepare_features(serializer.validated_data, metadata['features'])
+            feature_row = features.to_numpy(dtype=float)[0]
+            anytime = anytime_predict(
+                model, metadata['features'], feature_row,
+                batch_size=anytime_config['BATCH_SIZE'],
+                budget_ms=admission.degraded_budget_ms,
+                exact=serializer.validated_data.get('exact_probability', False),
+            )
+            survival_prob, prediction = anytime.probability, anytime.survived
+        elif inference_pool is not None:
+            # Featurize and predict in a worker process, outside this thread's GIL
+            try:
+                survival_prob, prediction, feature_row = inference_pool.predict(serializer.validated_data)
+            except PoolSaturated:
+                raise
+            except (TimeoutError, RuntimeError) as e:
+                print(f"[Django] Inference pool failed ({e}), predicting in-thread")
+                survival_prob, prediction, feature_row = predict_in_thread(
+                    model, serializer.validated_data, metadata['features'])
+        elif anytime_config['ENABLED'] and hasattr(model, 'estimators_'):
+            # Stop evaluating trees once survived/survival_chance cannot change
+            features = prepare_features(serializer.validated_data, metadata['features'])
+            feature_row = features.to_numpy(dtype=float)[0]
+            anytime = anytime_predict(
+                model, metadata['features'], feature_row,
+                batch_size=anytime_config['BATCH_SIZE'],
+                budget_ms=anytime_config['LATENCY_BUDGET_MS'],
+                exact=serializer.validated_data.get('exact_probability', False),
+            )
+            survival_prob, prediction = anytime.probability, anytime.survived
+        else:
+            survival_prob, prediction, feature_row = predict_in_thread(
+                model, serializer.validated_data, metadata['features'])
+        inference_ms = (time.perf_counter() - inference_start) * 1000
         
         # Prepare response
-        survival_prob = float(probability[1])
         survived = bool(prediction)
         
         # Determine survival chance category
-        if survival_prob < 0.3:
-            survival_chance = "Low"
-        elif survival_prob < 0.6:
-            survival_chance = "Medium"
-        else:
-            survival_chance = "High"
+        survival_chance = survival_chance_for(survival_prob)
         
         response_data = {
             'survived': survived,
             'probability': survival_prob,
             'survival_chance': survival_chance,
-            'model_type': metadata['model_type'],
-            'model_accuracy': metadata['accuracy'],
-            'features_used': list(features.columns)
+            'model_type': model_type,
+            'model_accuracy': model_accuracy,
+            'model_tier': tier,
+            'features_used': features_used
         }
+        if anytime is not None:
+            response_data.update({
+                'trees_used': anytime.trees_used,
+                'trees_total': anytime.trees_total,
+                'probability_exact': anytime.exact,
+            })
+        
+        drift_monitor = get_drift_monitor(metadata['drift_baseline_path'])
+        if drift_monitor is not None and feature_row is not None:
+            drift_monitor.observe(
+                observed_values(serializer.validated_data, metadata['features'], feature_row, survival_prob))
+        
+        shadow_scorer = get_shadow_scorer()
+        if shadow_scorer is not None and tier == 'primary':
+            shadow_scorer.submit(serializer.validated_data, survival_prob, survived, inference_ms)
         
+        prediction_log = get_prediction_log()
+        if prediction_log is not None:
+            prediction_log.submit({
+                'input_data': dict(serializer.validated_data),
+                'survived': survived,
+                'probability': survival_prob,
+                'survival_chance': survival_chance,
+                'model_type': model_type,
+                'model_version': model_version,
+                'latency_ms': (time.perf_counter() - start_time) * 1000,
+            })
+        
+        succeeded = True
         output_serializer = PredictionOutputSerializer(data=response_data)
         if output_serializer.is_valid():
             return Response(output_serializer.validated_data)
@@ -224,11 +276,21 @@ def predict_survival(request):
             'message': 'Please train the model first by running the training scripts.'
         }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
     
+    except PoolSaturated as e:
+        return Response({
+            'error': str(e),
+            'message': 'Too many predictions in progress, please retry.'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
     except Exception as e:
         return Response({
             'error': str(e),
             'message': 'An error occurred during prediction.'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    finally:
+        if admission is not None:
+            admission.release(tier, (time.perf_counter() - start_time) * 1000, succeeded)
 
 
 @api_view(['GET'])
@@ -247,3 +309,100 @@ def model_info(request):
         return Response({
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def drift_report(request):
+    """Compare live input/output distributions against the training baseline"""
+    try:
+        model, metadata = load_model()
+        drift_monitor = get_drift_monitor(metadata['drift_baseline_path'])
+        if drift_monitor is None:
+            return Response({
+                'error': 'No drift baseline found.',
+                'message': 'Re-run the training scripts to generate drift_baseline*.json.'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        return Response(drift_monitor.report())
+    except Exception as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def shadow_report(request):
+    """Compare candidate models scored in shadow mode against the primary model"""
+    shadow_scorer = get_shadow_scorer()
+    if shadow_scorer is None:
+        return Response({
+            'error': 'Shadow scoring is disabled.',
+            'message': 'Enable SHADOW_SCORING and list candidate models in settings.py.'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(shadow_scorer.report())
+
+
+@api_view(['GET'])
+def admission_report(request):
+    """In-flight requests, recent latency and how many requests each tier served"""
+    admission = get_admission_controller()
+    if admission is None:
+        return Response({
+            'error': 'Admission control is disabled.',
+            'message': 'Enable ADMISSION_CONTROL in settings.py.'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(admission.stats())
+
+
+def load_edge_model():
+    """Load the compact logistic model exported by scripts/04_train_edge_model.py"""
+    global _edge_model
+    
+    base_dir = Path(__file__).resolve().parent.parent.parent
+    edge_model_path = base_dir / 'edge_model.json'
+    if not edge_model_path.exists():
+        raise FileNotFoundError(
+            "No edge model found. Please run scripts/04_train_edge_model.py first."
+        )
+    
+    # Re-read only when the artifact on disk changes
+    mtime = edge_model_path.stat().st_mtime
+    if _edge_model is None or _edge_model[0] != mtime:
+        import json
+        with open(edge_model_path, 'r') as f:
+            _edge_model = (mtime, json.load(f))
+    return _edge_model[1]
+
+
+def edge_probability(artifact, data):
+    """Score validated input with the edge model (same features as edgeModelProbability in route.ts)"""
+    logit = artifact['intercept']
+    for feature, value in passenger_features(data).items():
+        logit += artifact['coefficients'].get(feature, 0.0) * value
+    # Numerically stable sigmoid: sibsp/parch have no upper bound, so |logit| can be huge
+    if logit >= 0:
+        return 1 / (1 + math.exp(-logit))
+    z = math.exp(logit)
+    return z / (1 + z)
+
+
+@api_view(['GET'])
+def edge_model(request):
+    """Serve the edge fallback coefficients with an ETag so clients can revalidate cheaply"""
+    try:
+        artifact = load_edge_model()
+    except FileNotFoundError as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    etag = f'"{artifact["version"]}"'
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'public, max-age=300',
+    }
+    if etag in request.headers.get('If-None-Match', ''):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(artifact, headers=headers)
@@ -113,3 +113,48 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.JSONParser',
     ],
 }
+
+# Write-behind prediction log (see predictions/prediction_log.py)
+PREDICTION_LOG = {
+    'ENABLED': True,
+    'MAX_QUEUE': 10000,         # bounded buffer; records beyond this follow DROP_POLICY
+    'BATCH_SIZE': 500,          # flush as soon as this many records are pending
+    'FLUSH_INTERVAL': 2.0,      # ...or after this many seconds
+    'DROP_POLICY': 'drop_newest',  # or 'drop_oldest'
+    'SHUTDOWN_TIMEOUT': 10.0,   # seconds to wait for the final flush at exit
+}
+
+# Shadow scoring of candidate models (see predictions/shadow.py)
+SHADOW_SCORING = {
+    'ENABLED': False,
+    'CANDIDATES': [],           # e.g. ['candidates/titanic_model_optimized.pkl'], relative to the project root
+    'EXECUTOR': 'thread',       # or 'process' to keep candidate scoring off the request threads' GIL
+    'WORKERS': 1,
+    'MAX_QUEUE': 1000,          # vectors in flight before new ones are shed
+}
+
+# Process-pool inference executor (see predictions/inference_pool.py)
+INFERENCE_POOL = {
+    'ENABLED': False,
+    'WORKERS': 2,               # worker processes, each with its own copy of the model
+    'SLOTS': 64,                # shared-memory request slots (max requests in flight)
+    'TIMEOUT': 5.0,             # seconds to wait for a free slot and for the result
+}
+
+# Anytime prediction with early exit across trees (see predictions/anytime.py)
+ANYTIME_PREDICTION = {
+    'ENABLED': False,
+    'BATCH_SIZE': 16,           # trees evaluated between checks
+    'LATENCY_BUDGET_MS': None,  # e.g. 20: stop early even if the outcome is not settled
+}
+
+# Admission control and graceful degradation under overload (see predictions/admission.py)
+ADMISSION_CONTROL = {
+    'ENABLED': False,
+    'MAX_IN_FLIGHT': 32,            # reject with 503 + Retry-After beyond this many concurrent requests
+    'DEGRADE_IN_FLIGHT': 16,        # serve from the cheaper tier beyond this many
+    'LATENCY_SLO_MS': 200.0,        # ...or while the moving average latency is above the SLO
+    'LATENCY_EWMA_ALPHA': 0.1,
+    'RETRY_AFTER_SECONDS': 1,
+    'DEGRADED_BUDGET_MS': 10.0,     # early-exit forest budget when edge_model.json is missing
+}
@@ -1,18 +1,148 @@
 """
 Script de Análisis Exploratorio de Datos del Titanic
 Analiza y limpia los datos antes del entrenamiento del modelo
+
+Uso:
+    python scripts/01_analyze_data.py                  # carga completa en memoria
+    python scripts/01_analyze_data.py --stream         # por bloques, memoria constante
+    python scripts/01_analyze_data.py --stream --train parte1.csv --save-partial p1.json
+    python scripts/01_analyze_data.py --stream --merge p1.json p2.json
 """
 
+import argparse
+import sys
+
 import pandas as pd
 import numpy as np
 
+from passenger_store import load_dataset
+
+parser = argparse.ArgumentParser(description="Análisis exploratorio del Titanic")
+parser.add_argument('--stream', action='store_true',
+                    help="Procesar los CSV por bloques en memoria constante")
+parser.add_argument('--chunksize', type=int, default=100_000,
+                    help="Registros por bloque en modo streaming")
+parser.add_argument('--train', nargs='+', default=['train.csv'],
+                    help="CSV, almacenes .tcol o fragmentos de entrenamiento en modo streaming")
+parser.add_argument('--test', default='test.csv',
+                    help="CSV o almacén .tcol de prueba en modo streaming")
+parser.add_argument('--save-partial', metavar='JSON',
+                    help="Guardar el resumen parcial del fragmento sin imprimir el reporte")
+parser.add_argument('--merge', nargs='+', metavar='JSON',
+                    help="Combinar resúmenes parciales en lugar de leer --train")
+args = parser.parse_args()
+
+
+def imprimir_reporte_streaming(summary, test_rows):
+    """Imprime el mismo reporte que el modo en memoria a partir de un PassengerSummary"""
+    from streaming_stats import AGE_LABELS
+
+    def tasa(count, survived):
+        return survived / count * 100 if count else float('nan')
+
+    print("\n📊 INFORMACIÓN GENERAL DEL DATASET")
+    print("-" * 60)
+    print(f"Registros de entrenamiento: {summary.rows}")
+    print(f"Registros de prueba: {test_rows}")
+    print(f"\nColumnas: {summary.columns}")
+
+    print("\n⚓ ESTADÍSTICAS DE SUPERVIVENCIA")
+    print("-" * 60)
+    survival_rate = (summary.survived / summary.rows) * 100
+    print(f"Sobrevivieron: {summary.survived} ({survival_rate:.1f}%)")
+    print(f"No sobrevivieron: {summary.rows - summary.survived} ({100-survival_rate:.1f}%)")
+
+    print("\n🎫 SUPERVIVENCIA POR CLASE")
+    print("-" * 60)
+    for pclass in [1, 2, 3]:
+        count, survived = summary.groups['Pclass'].get(pclass, [0, 0])
+        print(f"Clase {pclass}: {tasa(count, survived):.1f}% de supervivencia")
+
+    print("\n👥 SUPERVIVENCIA POR GÉNERO")
+    print("-" * 60)
+    for sex in ['male', 'female']:
+        count, survived = summary.groups['Sex'].get(sex, [0, 0])
+        print(f"{sex.capitalize()}: {tasa(count, survived):.1f}% de supervivencia")
+
+    print("\n👔 ANÁLISIS DE TÍTULOS (EXTRAÍDOS DE NOMBRES)")
+    print("-" * 60)
+    print("Títulos encontrados:")
+    for title, count, survived in summary.group('Title'):
+        print(f"  {title}: {count} pasajeros ({tasa(count, survived):.1f}% supervivencia)")
+
+    print("\n🚪 ANÁLISIS DE CUBIERTAS (EXTRAÍDAS DE CABIN)")
+    print("-" * 60)
+    print("Cubiertas encontradas:")
+    for deck, count, survived in summary.group('Deck'):
+        deck_name = 'Desconocida' if deck == 'U' else f'Cubierta {deck}'
+        print(f"  {deck_name}: {count} pasajeros ({tasa(count, survived):.1f}% supervivencia)")
+
+    print("\n📅 ANÁLISIS DE GRUPOS DE EDAD")
+    print("-" * 60)
+    print("Grupos de edad:")
+    for age_group in AGE_LABELS:
+        count, survived = summary.groups['Age_Group'].get(age_group, [0, 0])
+        print(f"  {age_group} años: {count} pasajeros ({tasa(count, survived):.1f}% supervivencia)")
+
+    print("\n❓ VALORES NULOS")
+    print("-" * 60)
+    for col, nulls in summary.nulls.items():
+        if nulls > 0:
+            print(f"{col}: {nulls} valores nulos ({(nulls/summary.rows*100):.1f}%)")
+
+    print("\n📈 ESTADÍSTICAS DE EDAD")
+    print("-" * 60)
+    print(f"Edad promedio: {summary.age.mean:.1f} años")
+    print(f"Edad mediana: {summary.age_sketch.median():.1f} años")
+    print(f"Edad mínima: {summary.age.min:.0f} años")
+    print(f"Edad máxima: {summary.age.max:.0f} años")
+
+    print("\n💰 ESTADÍSTICAS DE TARIFA")
+    print("-" * 60)
+    print(f"Tarifa promedio: ${summary.fare.mean:.2f}")
+    print(f"Tarifa mediana: ${summary.fare_sketch.median():.2f}")
+    print(f"Tarifa mínima: ${summary.fare.min:.2f}")
+    print(f"Tarifa máxima: ${summary.fare.max:.2f}")
+
+    print("\n🚢 PUERTO DE EMBARQUE")
+    print("-" * 60)
+    for port, count, survived in summary.group('Embarked'):
+        port_name = {'S': 'Southampton', 'C': 'Cherbourg', 'Q': 'Queenstown'}.get(port, 'Desconocido')
+        print(f"{port_name} ({port}): {count} pasajeros ({tasa(count, survived):.1f}% supervivencia)")
+
+    print("\n" + "=" * 60)
+    print("✅ ANÁLISIS COMPLETADO")
+    print("=" * 60)
+
+
+if args.stream:
+    from streaming_stats import PassengerSummary, summarize_csv, count_rows
+
+    if args.merge:
+        summary = PassengerSummary.load(args.merge[0])
+        for path in args.merge[1:]:
+            summary.merge(PassengerSummary.load(path))
+    else:
+        summary = summarize_csv(args.train, chunksize=args.chunksize)
+
+    if args.save_partial:
+        summary.save(args.save_partial)
+        print(f"💾 Resumen parcial guardado en {args.save_partial} ({summary.rows} registros)")
+        sys.exit(0)
+
+    print("=" * 60)
+    print("ANÁLISIS EXPLORATORIO DE DATOS - TITANIC (STREAMING)")
+    print("=" * 60)
+    imprimir_reporte_streaming(summary, count_rows(args.test, chunksize=args.chunksize))
+    sys.exit(0)
+
 print("=" * 60)
 print("ANÁLISIS EXPLORATORIO DE DATOS - TITANIC")
 print("=" * 60)
 
 # Cargar datos
-train_df = pd.read_csv('train.csv')
-test_df = pd.read_csv('test.csv')
+train_df = load_dataset('train')
+test_df = load_dataset('test')
 
 print("\n📊 INFORMACIÓN GENERAL DEL DATASET")
 print("-" * 60)
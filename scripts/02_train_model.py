@@ -10,54 +10,24 @@ from sklearn.model_selection import train_test_split, cross_val_score
 import pickle
 import json
 
+from passenger_store import load_dataset
+from titanic_features import prepare_data, feature_columns
+from drift_baseline import build_baseline, save_baseline
+
 print("=" * 60)
 print("ENTRENAMIENTO DEL MODELO - RANDOM FOREST")
 print("=" * 60)
 
 # Cargar datos
 print("\n📂 Cargando datos...")
-train_df = pd.read_csv('train.csv')
-
-# Función de limpieza y preparación de datos
-def prepare_data(df):
-    """Limpia y prepara los datos para el modelo con ingeniería de características avanzada"""
-    df = df.copy()
-    
-    # Rellenar valores nulos
-    df['Age'].fillna(df['Age'].median(), inplace=True)
-    df['Fare'].fillna(df['Fare'].median(), inplace=True)
-    df['Embarked'].fillna(df['Embarked'].mode()[0], inplace=True)
-    
-    df['Title'] = df['Name'].str.extract(' ([A-Za-z]+)\.', expand=False)
-    # Agrupar títulos raros en 'Rare'
-    rare_titles = ['Dr', 'Rev', 'Col', 'Major', 'Capt', 'Jonkheer', 'Don', 'Sir', 
-                   'Lady', 'Countess', 'Dona', 'Mme', 'Mlle', 'Ms']
-    df['Title'] = df['Title'].replace(rare_titles, 'Rare')
-    
-    df['Deck'] = df['Cabin'].str[0]
-    df['Deck'].fillna('U', inplace=True)  # U = Unknown
-    
-    df['Age_Group'] = pd.cut(df['Age'], 
-                              bins=[0, 16, 30, 50, 100], 
-                              labels=['0-16', '17-30', '31-50', '51+'])
-    
-    # Crear feature de tamaño de familia
-    df['FamilySize'] = df['SibSp'] + df['Parch'] + 1
-    
-    # Crear feature de si viaja solo
-    df['IsAlone'] = (df['FamilySize'] == 1).astype(int)
-    
-    df = pd.get_dummies(df, columns=['Sex', 'Embarked', 'Title', 'Deck', 'Age_Group'], 
-                        drop_first=False)
-    
-    return df
+train_df = load_dataset('train')
 
 print("🧹 Limpiando y preparando datos con ingeniería de características avanzada...")
+raw_train_df = train_df
 train_df = prepare_data(train_df)
 
 # Excluir columnas que no son features
-exclude_cols = ['PassengerId', 'Survived', 'Name', 'Ticket', 'Cabin', 'Age']
-features = [col for col in train_df.columns if col not in exclude_cols]
+features = feature_columns(train_df)
 
 X = train_df[features]
 y = train_df['Survived']
@@ -126,10 +96,16 @@ metadata = {
 with open('model_metadata.json', 'w') as f:
     json.dump(metadata, f, indent=2)
 
+# Guardar línea base de distribuciones para el monitoreo de drift en Django
+# (probabilidades solo sobre validación: en las filas de entrenamiento el bosque es demasiado seguro)
+baseline = build_baseline(raw_train_df, model.predict_proba(X_val)[:, 1], 'titanic_model.pkl')
+save_baseline(baseline, 'drift_baseline.json')
+
 print("\n" + "=" * 60)
 print("✅ MODELO ENTRENADO Y GUARDADO EXITOSAMENTE")
 print("=" * 60)
 print("\nArchivos generados:")
 print("  - titanic_model.pkl (modelo Random Forest entrenado)")
 print("  - model_metadata.json (metadata del modelo)")
+print("  - drift_baseline.json (línea base para monitoreo de drift)")
 print(f"\n🎯 Mejora esperada: ~82-85% de precisión con Random Forest")
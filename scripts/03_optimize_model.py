@@ -11,58 +11,24 @@ import pickle
 import json
 from datetime import datetime
 
+from passenger_store import load_dataset
+from titanic_features import prepare_data, feature_columns
+from drift_baseline import build_baseline, save_baseline
+
 print("=" * 60)
 print("OPTIMIZACIÓN DEL MODELO - GRIDSEARCHCV")
 print("=" * 60)
 
 # Cargar datos
 print("\n📂 Cargando datos...")
-train_df = pd.read_csv('train.csv')
-
-# Función de limpieza y preparación de datos
-def prepare_data(df):
-    """Limpia y prepara los datos para el modelo con ingeniería de características avanzada"""
-    df = df.copy()
-    
-    # Rellenar valores nulos
-    df['Age'].fillna(df['Age'].median(), inplace=True)
-    df['Fare'].fillna(df['Fare'].median(), inplace=True)
-    df['Embarked'].fillna(df['Embarked'].mode()[0], inplace=True)
-    
-    # Extraer título del nombre
-    df['Title'] = df['Name'].str.extract(' ([A-Za-z]+)\.', expand=False)
-    # Agrupar títulos raros en 'Rare'
-    rare_titles = ['Dr', 'Rev', 'Col', 'Major', 'Capt', 'Jonkheer', 'Don', 'Sir', 
-                   'Lady', 'Countess', 'Dona', 'Mme', 'Mlle', 'Ms']
-    df['Title'] = df['Title'].replace(rare_titles, 'Rare')
-    
-    # Extraer cubierta (Deck) de la cabina
-    df['Deck'] = df['Cabin'].str[0]
-    df['Deck'].fillna('U', inplace=True)  # U = Unknown
-    
-    # Crear grupos de edad
-    df['Age_Group'] = pd.cut(df['Age'], 
-                              bins=[0, 16, 30, 50, 100], 
-                              labels=['0-16', '17-30', '31-50', '51+'])
-    
-    # Crear feature de tamaño de familia
-    df['FamilySize'] = df['SibSp'] + df['Parch'] + 1
-    
-    # Crear feature de si viaja solo
-    df['IsAlone'] = (df['FamilySize'] == 1).astype(int)
-    
-    # One-Hot Encoding para variables categóricas
-    df = pd.get_dummies(df, columns=['Sex', 'Embarked', 'Title', 'Deck', 'Age_Group'], 
-                        drop_first=False)
-    
-    return df
+train_df = load_dataset('train')
 
 print("🧹 Limpiando y preparando datos con ingeniería de características avanzada...")
+raw_train_df = train_df
 train_df = prepare_data(train_df)
 
 # Excluir columnas que no son features
-exclude_cols = ['PassengerId', 'Survived', 'Name', 'Ticket', 'Cabin', 'Age']
-features = [col for col in train_df.columns if col not in exclude_cols]
+features = feature_columns(train_df)
 
 X = train_df[features]
 y = train_df['Survived']
@@ -195,12 +161,18 @@ with open('model_metadata_optimized.json', 'w') as f:
 cv_results = pd.DataFrame(grid_search.cv_results_)
 cv_results.to_csv('gridsearch_results.csv', index=False)
 
+# Guardar línea base de distribuciones para el monitoreo de drift en Django
+# (probabilidades solo sobre validación: en las filas de entrenamiento el bosque es demasiado seguro)
+baseline = build_baseline(raw_train_df, best_model.predict_proba(X_val)[:, 1], 'titanic_model_optimized.pkl')
+save_baseline(baseline, 'drift_baseline_optimized.json')
+
 print("\n" + "=" * 60)
 print("✅ MODELO OPTIMIZADO Y GUARDADO EXITOSAMENTE")
 print("=" * 60)
 print("\nArchivos generados:")
 print("  - titanic_model_optimized.pkl (modelo Random Forest optimizado)")
 print("  - model_metadata_optimized.json (metadata del modelo)")
+print("  - drift_baseline_optimized.json (línea base para monitoreo de drift)")
 print("  - gridsearch_results.csv (resultados completos de GridSearchCV)")
 print(f"\n🎯 Precisión de validación: {val_score*100:.2f}%")
 print(f"🎯 Reducción de overfitting: Objetivo alcanzado")
@@ -0,0 +1,141 @@
+"""
+Script de Entrenamiento del Modelo Compacto para el Edge - Regresión Logística
+Ajusta una regresión logística sobre las mismas características que el Random
+Forest y exporta sus coeficientes como artefacto JSON versionado, que Django
+sirve en /api/edge-model/ para el fallback de app/api/predict/route.ts
+"""
+
+import pandas as pd
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.pipeline import make_pipeline
+import pickle
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+from passenger_store import load_dataset
+from titanic_features import prepare_data, feature_columns, TITLE_PATTERN, COMMON_TITLES, AGE_BINS, AGE_LABELS
+
+print("=" * 60)
+print("ENTRENAMIENTO DEL MODELO COMPACTO (EDGE) - REGRESIÓN LOGÍSTICA")
+print("=" * 60)
+
+# Cargar datos
+print("\n📂 Cargando datos...")
+train_df = load_dataset('train')
+
+print("🧹 Limpiando y preparando datos con ingeniería de características avanzada...")
+train_df = prepare_data(train_df)
+
+# Excluir columnas que no son features
+features = feature_columns(train_df)
+
+X = train_df[features].astype(float)
+y = train_df['Survived']
+
+print(f"\n📋 Features utilizadas: {len(features)}")
+
+# Mismo split que 02_train_model.py y 03_optimize_model.py
+X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42)
+
+print("\n📈 Entrenando regresión logística (con estandarización)...")
+pipeline = make_pipeline(StandardScaler(), LogisticRegression(C=1.0, max_iter=1000))
+pipeline.fit(X_train, y_train)
+
+train_score = pipeline.score(X_train, y_train)
+val_score = pipeline.score(X_val, y_val)
+cv_scores = cross_val_score(pipeline, X_train, y_train, cv=5)
+
+print("\n📈 RESULTADOS DEL MODELO COMPACTO")
+print("-" * 60)
+print(f"Precisión en entrenamiento: {train_score*100:.2f}%")
+print(f"Precisión en validación: {val_score*100:.2f}%")
+print(f"Precisión promedio (CV): {cv_scores.mean()*100:.2f}% (+/- {cv_scores.std()*100:.2f}%)")
+
+# Referencia: el Random Forest que sirve Django, para conocer la brecha de precisión
+print("\n🌲 Comparando con el Random Forest de referencia...")
+reference_name = None
+for model_file in ['titanic_model_optimized.pkl', 'titanic_model.pkl']:
+    if Path(model_file).exists():
+        with open(model_file, 'rb') as f:
+            reference = pickle.load(f)
+        reference_name = model_file
+        break
+else:
+    reference = RandomForestClassifier(
+        n_estimators=100,
+        random_state=42,
+        max_depth=10,
+        min_samples_split=5,
+        min_samples_leaf=2
+    )
+    reference.fit(X_train, y_train)
+    reference_name = 'Random Forest (entrenado para la comparación)'
+
+reference_score = reference.score(X_val, y_val)
+agreement = float((reference.predict(X_val) == pipeline.predict(X_val)).mean())
+accuracy_gap = reference_score - val_score
+
+print(f"Referencia: {reference_name}")
+print(f"Precisión de la referencia en validación: {reference_score*100:.2f}%")
+print(f"Brecha de precisión (referencia - logística): {accuracy_gap*100:.2f}%")
+print(f"Acuerdo entre ambos modelos: {agreement*100:.2f}%")
+
+# Plegar la estandarización en los coeficientes: el edge usa las features sin escalar
+scaler = pipeline.named_steps['standardscaler']
+logistic = pipeline.named_steps['logisticregression']
+scale = np.where(scaler.scale_ == 0, 1.0, scaler.scale_)
+coefficients = logistic.coef_[0] / scale
+intercept = float(logistic.intercept_[0] - np.sum(logistic.coef_[0] * scaler.mean_ / scale))
+
+print("\n🔍 COEFICIENTES MÁS INFLUYENTES (TOP 10)")
+print("-" * 60)
+for idx in np.argsort(-np.abs(logistic.coef_[0]))[:10]:
+    print(f"{features[idx]}: {coefficients[idx]:+.4f}")
+
+artifact = {
+    'format': 'titanic-edge-logistic',
+    'features': features,
+    'intercept': intercept,
+    'coefficients': {feature: float(coef) for feature, coef in zip(features, coefficients)},
+    # Cómo construir las features a partir de la entrada cruda del formulario
+    'encoding': {
+        'title_pattern': TITLE_PATTERN,
+        'common_titles': COMMON_TITLES,
+        'rare_title': 'Rare',
+        'unknown_deck': 'U',
+        'age_bins': AGE_BINS,
+        'age_labels': AGE_LABELS,
+        'threshold': 0.5,
+    },
+    'metrics': {
+        'train_score': float(train_score),
+        'val_score': float(val_score),
+        'cv_mean': float(cv_scores.mean()),
+        'reference_model': reference_name,
+        'reference_val_score': float(reference_score),
+        'accuracy_gap': float(accuracy_gap),
+        'agreement_with_reference': agreement,
+    },
+}
+# La versión es un hash del contenido: cambia solo si cambian los coeficientes
+content = json.dumps({k: artifact[k] for k in ('features', 'intercept', 'coefficients', 'encoding')},
+                     sort_keys=True)
+artifact['version'] = hashlib.sha256(content.encode()).hexdigest()[:16]
+artifact['created_at'] = datetime.now().isoformat()
+
+print("\n💾 Guardando artefacto del modelo compacto...")
+with open('edge_model.json', 'w') as f:
+    json.dump(artifact, f, indent=2)
+
+print("\n" + "=" * 60)
+print("✅ MODELO COMPACTO ENTRENADO Y EXPORTADO")
+print("=" * 60)
+print("\nArchivos generados:")
+print(f"  - edge_model.json (coeficientes versionados, versión {artifact['version']})")
+print(f"\n🎯 Brecha conocida frente al Random Forest: {accuracy_gap*100:.2f}%")
@@ -0,0 +1,167 @@
+"""
+Script de Actualización Incremental del Modelo - Crecimiento del Random Forest
+Carga el modelo actual y le añade árboles entrenados con los nuevos datos
+etiquetados (warm_start), opcionalmente reemplazando los árboles más antiguos.
+El modelo nuevo solo se guarda si no empeora en el conjunto de validación.
+
+Uso:
+    python scripts/05_incremental_update.py --new-data nuevos.csv
+    python scripts/05_incremental_update.py --new-data nuevos.csv --trees 50 --policy replace
+"""
+
+import argparse
+import copy
+import json
+import pickle
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from passenger_store import is_store, load_dataset, load_passengers
+from titanic_features import prepare_data
+
+parser = argparse.ArgumentParser(description="Actualización incremental del Random Forest")
+parser.add_argument('--new-data', required=True,
+                    help="CSV o almacén .tcol con los nuevos pasajeros etiquetados")
+parser.add_argument('--trees', type=int, default=50,
+                    help="Árboles nuevos a entrenar con los datos añadidos")
+parser.add_argument('--policy', choices=['grow', 'replace'], default='grow',
+                    help="grow: añadir árboles; replace: añadir y retirar los más antiguos")
+parser.add_argument('--max-trees', type=int, default=1000,
+                    help="Límite de árboles con la política grow")
+parser.add_argument('--old-fraction', type=float, default=1.0,
+                    help="Fracción de train.csv que se mezcla con los datos nuevos para los árboles nuevos")
+parser.add_argument('--holdout', type=float, default=0.2,
+                    help="Fracción de los datos nuevos reservada para validación")
+parser.add_argument('--tolerance', type=float, default=0.0,
+                    help="Caída máxima de precisión aceptada en validación")
+args = parser.parse_args()
+
+print("=" * 60)
+print("ACTUALIZACIÓN INCREMENTAL DEL MODELO - RANDOM FOREST")
+print("=" * 60)
+
+# Cargar el modelo actual (el mismo que usaría Django)
+print("\n📂 Cargando modelo actual...")
+model_path = None
+for candidate, metadata_file in [('titanic_model_optimized.pkl', 'model_metadata_optimized.json'),
+                                 ('titanic_model.pkl', 'model_metadata.json')]:
+    if Path(candidate).exists():
+        model_path, metadata_path = Path(candidate), Path(metadata_file)
+        break
+if model_path is None:
+    raise FileNotFoundError(
+        "No trained model found. Please run scripts/02_train_model.py or "
+        "scripts/03_optimize_model.py first."
+    )
+
+with open(model_path, 'rb') as f:
+    current_model = pickle.load(f)
+features = list(current_model.feature_names_in_)
+print(f"Modelo: {model_path} ({len(current_model.estimators_)} árboles, {len(features)} features)")
+
+# Los datos nuevos pueden no tener todas las categorías: alinear con las columnas del modelo
+def to_features(df):
+    prepared = prepare_data(df)
+    return prepared.reindex(columns=features, fill_value=0), prepared['Survived']
+
+print("\n📂 Cargando datos...")
+train_df = load_dataset('train')
+new_df = load_passengers(args.new_data) if is_store(args.new_data) else pd.read_csv(args.new_data)
+print(f"Datos originales: {len(train_df)} registros")
+print(f"Datos nuevos: {len(new_df)} registros")
+
+X_old, y_old = to_features(train_df)
+X_new, y_new = to_features(new_df)
+
+# Mismo split que 02/03 para no validar con filas que el modelo ya vio
+X_old_train, X_old_val, y_old_train, y_old_val = train_test_split(
+    X_old, y_old, test_size=0.2, random_state=42)
+X_new_train, X_new_val, y_new_train, y_new_val = train_test_split(
+    X_new, y_new, test_size=args.holdout, random_state=42)
+
+X_holdout = pd.concat([X_old_val, X_new_val])
+y_holdout = pd.concat([y_old_val, y_new_val])
+
+if args.old_fraction > 0:
+    old_sample = X_old_train.sample(frac=args.old_fraction, random_state=42)
+    X_fit = pd.concat([old_sample, X_new_train])
+    y_fit = pd.concat([y_old_train.loc[old_sample.index], y_new_train])
+else:
+    X_fit, y_fit = X_new_train, y_new_train
+
+# Crecer el bosque: warm_start conserva los árboles existentes y entrena solo los nuevos
+n_before = len(current_model.estimators_)
+n_trees = args.trees
+if args.policy == 'grow':
+    n_trees = max(0, min(args.trees, args.max_trees - n_before))
+    if n_trees == 0:
+        raise SystemExit(f"❌ El modelo ya tiene {n_before} árboles (límite --max-trees {args.max_trees})")
+
+print(f"\n🌲 Entrenando {n_trees} árboles nuevos con {len(X_fit)} registros (política: {args.policy})...")
+start_time = datetime.now()
+updated_model = copy.deepcopy(current_model)
+updated_model.set_params(warm_start=True, n_estimators=n_before + n_trees)
+updated_model.fit(X_fit, y_fit)
+
+if args.policy == 'replace':
+    # Retirar los árboles más antiguos para mantener el tamaño del bosque
+    updated_model.estimators_ = updated_model.estimators_[n_trees:]
+    updated_model.n_estimators = len(updated_model.estimators_)
+updated_model.set_params(warm_start=False)
+duration = (datetime.now() - start_time).total_seconds()
+
+# Validación antes de escribir
+current_score = current_model.score(X_holdout, y_holdout)
+updated_score = updated_model.score(X_holdout, y_holdout)
+new_rows_score = updated_model.score(X_new_val, y_new_val) if len(X_new_val) else float('nan')
+
+print("\n📈 VALIDACIÓN")
+print("-" * 60)
+print(f"Registros de validación: {len(X_holdout)} ({len(X_new_val)} nuevos)")
+print(f"Precisión del modelo actual: {current_score*100:.2f}%")
+print(f"Precisión del modelo actualizado: {updated_score*100:.2f}%")
+print(f"Precisión en los datos nuevos: {new_rows_score*100:.2f}%")
+print(f"Árboles: {n_before} → {len(updated_model.estimators_)}")
+print(f"⏱️ Tiempo de entrenamiento: {duration:.2f} segundos")
+
+if updated_score < current_score - args.tolerance:
+    print("\n❌ El modelo actualizado empeora en validación; no se guarda")
+    raise SystemExit(1)
+
+# Guardar el modelo actualizado, conservando una copia del anterior
+backup_path = model_path.with_suffix('.prev.pkl')
+shutil.copy(model_path, backup_path)
+print(f"\n💾 Guardando modelo actualizado en {model_path} (anterior en {backup_path})...")
+with open(model_path, 'wb') as f:
+    pickle.dump(updated_model, f)
+
+metadata = {}
+if metadata_path.exists():
+    with open(metadata_path, 'r') as f:
+        metadata = json.load(f)
+metadata.setdefault('incremental_updates', []).append({
+    'date': datetime.now().isoformat(),
+    'new_data': str(args.new_data),
+    'new_rows': int(len(new_df)),
+    'policy': args.policy,
+    'trees_added': int(n_trees),
+    'n_estimators': int(len(updated_model.estimators_)),
+    'holdout_score_before': float(current_score),
+    'holdout_score_after': float(updated_score),
+    'training_time_seconds': float(duration),
+})
+with open(metadata_path, 'w') as f:
+    json.dump(metadata, f, indent=2)
+
+print("\n" + "=" * 60)
+print("✅ MODELO ACTUALIZADO Y GUARDADO EXITOSAMENTE")
+print("=" * 60)
+print("\nArchivos generados:")
+print(f"  - {model_path} (modelo actualizado)")
+print(f"  - {backup_path} (modelo anterior)")
+print(f"  - {metadata_path} (historial de actualizaciones)")
@@ -0,0 +1,87 @@
+"""
+Benchmark de inferencia: hilos vs. pool de procesos
+Mide cuántas predicciones por segundo (featurización + predict) se obtienen
+al aumentar los núcleos, comparando el camino en el mismo hilo de Django con
+el pool de procesos de predictions/inference_pool.py.
+
+Uso:
+    python scripts/benchmark_inference.py --cores 1 2 4 8 --requests 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from load_test import payloads_from_passengers
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR / 'django_api'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'titanic_api.settings')
+    import django
+    django.setup()
+
+
+def measure(predict, payloads, total_requests, threads):
+    """Predicciones por segundo con `threads` hilos llamando a `predict`"""
+    for payload in payloads[:20]:
+        predict(payload)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda i: predict(payloads[i % len(payloads)]), range(total_requests)))
+    return total_requests / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark de inferencia en hilo vs. pool de procesos")
+    parser.add_argument('--cores', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--source', default=str(PROJECT_DIR / 'test.csv'))
+    parser.add_argument('--output', help="Guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    setup_django()
+    from predictions.views import load_model, prepare_features
+    from predictions.inference_pool import InferencePool
+
+    model, metadata = load_model()
+    payloads = payloads_from_passengers(args.source)
+
+    def predict_in_thread(data):
+        features = prepare_features(data, metadata['features'])
+        model.predict(features)
+        return float(model.predict_proba(features)[0][1])
+
+    print("=" * 60)
+    print("BENCHMARK DE INFERENCIA - HILOS VS. POOL DE PROCESOS")
+    print("=" * 60)
+    print(f"Modelo: {metadata['model_type']} | {args.requests} predicciones por medición")
+    print(f"CPUs disponibles: {os.cpu_count()} (con más núcleos que CPUs los procesos comparten CPU)")
+    print(f"\n{'Núcleos':>8} {'Hilo (pred/s)':>15} {'Pool (pred/s)':>15} {'Aceleración':>12}")
+    print("-" * 60)
+
+    results = []
+    for cores in args.cores:
+        in_thread = measure(predict_in_thread, payloads, args.requests, cores)
+
+        pool = InferencePool(metadata['model_path'], metadata['features'],
+                             workers=cores, slots=cores * 4, timeout=30.0)
+        try:
+            # Dos hilos cliente por proceso para que ningún worker quede ocioso
+            in_pool = measure(lambda data: pool.predict(data)[0], payloads, args.requests, cores * 2)
+        finally:
+            pool.close()
+
+        results.append({'cores': cores, 'cpus': os.cpu_count(), 'in_thread_qps': in_thread, 'pool_qps': in_pool})
+        print(f"{cores:>8} {in_thread:>15.1f} {in_pool:>15.1f} {in_pool / in_thread:>11.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Resultados guardados en {args.output}")
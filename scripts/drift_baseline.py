@@ -0,0 +1,80 @@
+"""
+Línea base de distribuciones para el monitoreo de drift
+Resume los datos de entrenamiento con los mismos histogramas y conteos de
+tamaño fijo que Django actualiza con cada predicción, para poder compararlos.
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+
+AGE_EDGES = [5, 10, 16, 20, 25, 30, 35, 40, 50, 60, 70, 80]
+FARE_EDGES = [5, 7.5, 10, 15, 20, 30, 50, 75, 100, 150, 250, 500]
+PROBABILITY_EDGES = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+CATEGORIES = {
+    'Pclass': ['1', '2', '3'],
+    'Sex': ['female', 'male'],
+    'Embarked': ['C', 'Q', 'S'],
+    'Title': ['Master', 'Miss', 'Mr', 'Mrs', 'Rare'],
+    'Deck': ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'T', 'U'],
+}
+
+
+def histogram(values, edges):
+    """Conteos por intervalo; el primero y el último son abiertos (len(edges) + 1 intervalos)"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    return np.bincount(np.searchsorted(edges, values, side='right'),
+                       minlength=len(edges) + 1).tolist()
+
+
+def category_counts(values, categories):
+    """Conteos por categoría; el último elemento acumula las categorías desconocidas"""
+    index = {category: i for i, category in enumerate(categories)}
+    counts = [0] * (len(categories) + 1)
+    for value in values:
+        counts[index.get(str(value), len(categories))] += 1
+    return counts
+
+
+def build_baseline(raw_df, probabilities, model_file):
+    """
+    Construye la línea base a partir del CSV original (sin preparar) y de las
+    probabilidades del modelo sobre filas que no vio al entrenar
+    """
+    title = raw_df['Name'].astype(str).str.extract(r' ([A-Za-z]+)\.', expand=False)
+    title = title.where(title.isin(['Mr', 'Miss', 'Mrs', 'Master']), 'Rare')
+    deck = raw_df['Cabin'].astype(object).str[0].fillna('U')
+
+    categorical_values = {
+        'Pclass': raw_df['Pclass'],
+        'Sex': raw_df['Sex'].dropna(),
+        'Embarked': raw_df['Embarked'].dropna(),
+        'Title': title,
+        'Deck': deck,
+    }
+
+    return {
+        'created_at': datetime.now().isoformat(),
+        'model_file': model_file,
+        'rows': int(len(raw_df)),
+        'probability_rows': int(len(probabilities)),
+        'numeric': {
+            'Age': {'edges': AGE_EDGES, 'counts': histogram(raw_df['Age'], AGE_EDGES)},
+            'Fare': {'edges': FARE_EDGES, 'counts': histogram(raw_df['Fare'], FARE_EDGES)},
+            'Probability': {'edges': PROBABILITY_EDGES,
+                            'counts': histogram(probabilities, PROBABILITY_EDGES)},
+        },
+        'categorical': {
+            name: {'categories': CATEGORIES[name],
+                   'counts': category_counts(values, CATEGORIES[name])}
+            for name, values in categorical_values.items()
+        },
+    }
+
+
+def save_baseline(baseline, path):
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
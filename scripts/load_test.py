@@ -0,0 +1,248 @@
+"""
+Prueba de carga por repetición de tráfico contra /api/predict/
+Repite pasajeros de test.csv (o peticiones grabadas en un .jsonl) con una
+concurrencia y un QPS objetivo configurables, y reporta throughput y
+latencias p50/p95/p99. El modo --in-process ejecuta la app de Django dentro
+del mismo proceso con el cliente de pruebas, sin necesidad de red.
+
+Uso:
+    python scripts/load_test.py --url http://localhost:8000 --concurrency 8 --qps 50
+    python scripts/load_test.py --in-process --requests 2000 --output base.json
+    python scripts/load_test.py --replay trafico.jsonl --in-process --output nuevo.json
+    python scripts/load_test.py --compare base.json nuevo.json
+
+Formato de --replay: una petición por línea, ya sea el cuerpo JSON de
+/api/predict/ o un objeto {"body": {...}}.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from passenger_store import is_store, load_passengers
+
+PREDICT_PATH = '/api/predict/'
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def _value(row, column, default):
+    value = row.get(column)
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return default
+    return value
+
+
+def payloads_from_passengers(path):
+    """Convierte cada pasajero del CSV (o almacén .tcol) en el cuerpo de una petición"""
+    df = load_passengers(path) if is_store(path) else pd.read_csv(path)
+    age_default = float(df['Age'].median())
+    fare_default = float(df['Fare'].median())
+    payloads = []
+    for row in df.to_dict('records'):
+        payloads.append({
+            'pclass': int(row['Pclass']),
+            'sex': str(row['Sex']),
+            'age': float(_value(row, 'Age', age_default)),
+            'sibsp': int(row['SibSp']),
+            'parch': int(row['Parch']),
+            'fare': float(_value(row, 'Fare', fare_default)),
+            'embarked': str(_value(row, 'Embarked', 'S')),
+            'name': str(_value(row, 'Name', '')),
+            'ticket': str(_value(row, 'Ticket', '')),
+            'cabin': str(_value(row, 'Cabin', '')),
+        })
+    return payloads
+
+
+def payloads_from_jsonl(path):
+    """Lee peticiones grabadas, una por línea"""
+    payloads = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            payloads.append(record.get('body', record))
+    return payloads
+
+
+def http_sender(base_url, timeout):
+    url = base_url.rstrip('/') + PREDICT_PATH
+
+    def send(payload):
+        request = urllib.request.Request(
+            url, data=json.dumps(payload).encode(), headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            return 'error'
+
+    return send
+
+
+def in_process_sender():
+    """Envía las peticiones a la app de Django cargada en este mismo proceso"""
+    sys.path.insert(0, str(PROJECT_DIR / 'django_api'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'titanic_api.settings')
+    import django
+    django.setup()
+    from django.test import Client
+
+    local = threading.local()
+
+    def send(payload):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client()
+        response = client.post(PREDICT_PATH, data=json.dumps(payload), content_type='application/json')
+        return response.status_code
+
+    return send
+
+
+def run_load_test(send, payloads, total_requests, concurrency, qps, warmup):
+    """
+    Ejecuta la prueba. Con QPS objetivo (lazo abierto) la latencia se mide desde el
+    instante programado de cada petición, para no ocultar el tiempo en cola.
+    """
+    for payload in payloads[:warmup]:
+        send(payload)
+
+    latencies = [0.0] * total_requests
+    statuses = [None] * total_requests
+    start = time.perf_counter()
+
+    def worker(i):
+        scheduled = start + i / qps if qps else None
+        if scheduled is not None:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        sent = time.perf_counter()
+        statuses[i] = send(payloads[i % len(payloads)])
+        latencies[i] = time.perf_counter() - (scheduled if scheduled is not None else sent)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    status_counts = Counter(str(s) for s in statuses)
+    ok = sum(count for s, count in status_counts.items() if s.startswith('2'))
+    return {
+        'requests': total_requests,
+        'concurrency': concurrency,
+        'target_qps': qps,
+        'elapsed_seconds': elapsed,
+        'throughput_qps': total_requests / elapsed,
+        'success_rate': ok / total_requests,
+        'status_counts': dict(status_counts),
+        'latency_ms': {
+            'mean': float(latencies_ms.mean()),
+            'p50': float(np.percentile(latencies_ms, 50)),
+            'p95': float(np.percentile(latencies_ms, 95)),
+            'p99': float(np.percentile(latencies_ms, 99)),
+            'max': float(latencies_ms.max()),
+        },
+    }
+
+
+def print_result(result):
+    print("\n📈 RESULTADOS DE LA PRUEBA DE CARGA")
+    print("-" * 60)
+    target = f"{result['target_qps']:.1f}" if result['target_qps'] else 'sin límite'
+    print(f"Peticiones: {result['requests']} (concurrencia {result['concurrency']}, QPS objetivo {target})")
+    print(f"Duración: {result['elapsed_seconds']:.2f} s")
+    print(f"Throughput: {result['throughput_qps']:.1f} peticiones/s")
+    print(f"Éxito: {result['success_rate']*100:.1f}% {result['status_counts']}")
+    latency = result['latency_ms']
+    print(f"Latencia (ms): media {latency['mean']:.1f} | p50 {latency['p50']:.1f} | "
+          f"p95 {latency['p95']:.1f} | p99 {latency['p99']:.1f} | máx {latency['max']:.1f}")
+
+
+def compare_runs(paths):
+    runs = []
+    for path in paths:
+        with open(path, 'r') as f:
+            runs.append((Path(path).name, json.load(f)))
+
+    print("\n⚖️ COMPARACIÓN DE EJECUCIONES")
+    print("-" * 60)
+    metrics = [
+        ('throughput_qps', 'Throughput (req/s)', lambda r: r['throughput_qps']),
+        ('success_rate', 'Éxito (%)', lambda r: r['success_rate'] * 100),
+        ('p50', 'Latencia p50 (ms)', lambda r: r['latency_ms']['p50']),
+        ('p95', 'Latencia p95 (ms)', lambda r: r['latency_ms']['p95']),
+        ('p99', 'Latencia p99 (ms)', lambda r: r['latency_ms']['p99']),
+    ]
+    print(f"{'':22}" + ''.join(f"{name[:18]:>20}" for name, _ in runs))
+    _, baseline = runs[0]
+    for _, label, get in metrics:
+        cells = []
+        for i, (_, run) in enumerate(runs):
+            value = get(run)
+            if i == 0 or get(baseline) == 0:
+                cells.append(f"{value:>20.1f}")
+            else:
+                delta = (value - get(baseline)) / get(baseline) * 100
+                cells.append(f"{f'{value:.1f} ({delta:+.0f}%)':>20}")
+        print(f"{label:22}" + ''.join(cells))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Prueba de carga de /api/predict/")
+    parser.add_argument('--url', default=os.environ.get('DJANGO_API_URL', 'http://localhost:8000'),
+                        help="URL base del servidor Django")
+    parser.add_argument('--in-process', action='store_true',
+                        help="Ejecutar la app de Django en este proceso (sin red)")
+    parser.add_argument('--source', default=str(PROJECT_DIR / 'test.csv'),
+                        help="CSV o almacén .tcol de pasajeros a repetir")
+    parser.add_argument('--replay', help="Archivo .jsonl con peticiones grabadas")
+    parser.add_argument('--requests', type=int, help="Total de peticiones (por defecto, una por pasajero)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--qps', type=float, default=0, help="QPS objetivo (0 = tan rápido como se pueda)")
+    parser.add_argument('--warmup', type=int, default=10, help="Peticiones de calentamiento no medidas")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--output', help="Guardar el resultado en JSON")
+    parser.add_argument('--compare', nargs='+', metavar='JSON', help="Comparar resultados guardados")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_runs(args.compare)
+        sys.exit(0)
+
+    payloads = payloads_from_jsonl(args.replay) if args.replay else payloads_from_passengers(args.source)
+    send = in_process_sender() if args.in_process else http_sender(args.url, args.timeout)
+    mode = 'en proceso' if args.in_process else args.url
+
+    print("=" * 60)
+    print(f"PRUEBA DE CARGA - /api/predict/ ({mode})")
+    print("=" * 60)
+    print(f"📂 {len(payloads)} peticiones distintas de {args.replay or args.source}")
+
+    result = run_load_test(send, payloads, args.requests or len(payloads),
+                           args.concurrency, args.qps, args.warmup)
+    result['mode'] = 'in-process' if args.in_process else 'http'
+    print_result(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Resultado guardado en {args.output}")
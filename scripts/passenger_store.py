@@ -0,0 +1,307 @@
+"""
+Formato columnar compacto y tipado para los datos de pasajeros
+Convierte los CSV del Titanic a un directorio con una columna por archivo .npy
+(enteros estrechos, cadenas codificadas con diccionario y máscaras de nulos
+explícitas) que se carga con memory-map en lugar de re-parsear el texto.
+
+Solo las cadenas con pocos valores distintos (Sex, Embarked) usan diccionario;
+las de alta cardinalidad (Name, Ticket, Cabin) se guardan como offsets sobre un
+buffer UTF-8, así que ni la conversión ni la lectura mantienen en memoria un
+conjunto con todos sus valores.
+
+Estructura de un almacén `train.tcol/`:
+    schema.json           filas, columnas, tipo y dtype de cada columna
+    <col>.npy             valores, códigos del diccionario u offsets (filas + 1)
+    <col>.nulls.npy       máscara de nulos empaquetada en bits (si hay nulos)
+    <col>.dict.json       diccionario de cadenas (columnas categóricas)
+    <col>.utf8.npy        bytes UTF-8 concatenados (columnas de texto libre)
+
+Uso:
+    python scripts/passenger_store.py train.csv train.tcol
+    python scripts/passenger_store.py test.csv test.tcol
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMAT_NAME = 'titanic-columnar'
+FORMAT_VERSION = 2
+SCHEMA_FILE = 'schema.json'
+STORE_SUFFIX = '.tcol'
+
+# Una columna de texto usa diccionario solo si tiene como mucho MAX_CATEGORIES
+# valores distintos y estos no superan esta fracción de sus valores no nulos
+MAX_CATEGORIES = 1000
+MAX_CATEGORY_RATIO = 0.5
+
+INT_DTYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _narrow_int_dtype(low, high):
+    """Entero con signo más pequeño que contiene el rango [low, high]"""
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _code_dtype(size):
+    # -1 se reserva para los nulos
+    return _narrow_int_dtype(-1, size)
+
+
+def is_store(path):
+    """Indica si `path` es un almacén columnar"""
+    return (Path(path) / SCHEMA_FILE).exists()
+
+
+def _scan_csv(csv_path, chunksize):
+    """Primera pasada: tipos, rangos, nulos, diccionarios y bytes de texto de cada columna"""
+    rows = 0
+    columns = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        rows += len(chunk)
+        for name in chunk.columns:
+            series = chunk[name]
+            info = columns.setdefault(name, {
+                'strings': set(), 'numeric': True, 'integral': True, 'float32': True,
+                'min': None, 'max': None, 'nulls': False,
+            })
+            values = series.dropna()
+            info['nulls'] |= len(values) < len(series)
+            if series.dtype == object or not info['numeric']:
+                info['numeric'] = False
+                continue
+            if len(values) == 0:
+                continue
+            values = values.to_numpy(dtype=float)
+            info['integral'] &= bool(np.all(values == np.round(values)))
+            info['float32'] &= bool(np.array_equal(values.astype(np.float32).astype(float), values))
+            low, high = values.min(), values.max()
+            info['min'] = low if info['min'] is None else min(info['min'], low)
+            info['max'] = high if info['max'] is None else max(info['max'], high)
+
+    # Los diccionarios se construyen con el texto original (una columna puede parecer
+    # numérica en los primeros bloques y no serlo en los siguientes)
+    text_columns = [name for name, info in columns.items() if not info['numeric']]
+    for name in text_columns:
+        columns[name].update(count=0, utf8_bytes=0)
+    if text_columns:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, usecols=text_columns, dtype=str):
+            for name in text_columns:
+                info = columns[name]
+                values = chunk[name].dropna()
+                info['count'] += len(values)
+                info['utf8_bytes'] += int(values.str.encode('utf-8').str.len().sum())
+                if info['strings'] is not None:
+                    info['strings'].update(values.unique())
+                    if len(info['strings']) > MAX_CATEGORIES:
+                        # Texto libre: se deja de acumular el conjunto de valores
+                        info['strings'] = None
+    for name in text_columns:
+        info = columns[name]
+        if info['strings'] is not None and len(info['strings']) > MAX_CATEGORY_RATIO * info['count']:
+            info['strings'] = None
+    return rows, columns
+
+
+def convert_csv(csv_path, store_path, chunksize=100_000):
+    """Convierte un CSV de pasajeros al formato columnar (dos pasadas, memoria acotada)"""
+    store_path = Path(store_path)
+    store_path.mkdir(parents=True, exist_ok=True)
+    rows, scanned = _scan_csv(csv_path, chunksize)
+
+    schema = {'format': FORMAT_NAME, 'version': FORMAT_VERSION, 'rows': rows, 'columns': []}
+    outputs = {}
+    for name, info in scanned.items():
+        column = {'name': name, 'nulls': info['nulls']}
+        shape = (rows,)
+        if not info['numeric'] and info['strings'] is not None:
+            dictionary = sorted(info['strings'])
+            column.update(kind='category', dtype=_code_dtype(len(dictionary)).name)
+            with open(store_path / f'{name}.dict.json', 'w') as f:
+                json.dump(dictionary, f)
+            # Índice construido una sola vez para todos los bloques
+            column['_index'] = pd.Index(dictionary)
+        elif not info['numeric']:
+            column.update(kind='string', dtype=_narrow_int_dtype(0, info['utf8_bytes']).name)
+            shape = (rows + 1,)
+            column['_utf8'] = np.lib.format.open_memmap(
+                store_path / f'{name}.utf8.npy', mode='w+', dtype=np.uint8, shape=(info['utf8_bytes'],))
+            column['_offset'] = 0
+        elif info['integral'] and info['min'] is not None:
+            column.update(kind='int', dtype=_narrow_int_dtype(info['min'], info['max']).name)
+        else:
+            column.update(kind='float', dtype='float32' if info['float32'] else 'float64')
+
+        outputs[name] = np.lib.format.open_memmap(
+            store_path / f'{name}.npy', mode='w+', dtype=column['dtype'], shape=shape)
+        if column['nulls']:
+            column['_mask'] = np.zeros(rows, dtype=bool)
+        schema['columns'].append(column)
+
+    # Segunda pasada: escribir los valores directamente en los archivos mapeados
+    text_columns = {
+        column['name']: str for column in schema['columns'] if column['kind'] in ('category', 'string')
+    }
+    start = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=text_columns):
+        stop = start + len(chunk)
+        for column in schema['columns']:
+            series = chunk[column['name']]
+            nulls = series.isna().to_numpy()
+            if column['kind'] == 'string':
+                _write_strings(column, outputs[column['name']], series, start, stop)
+            elif column['kind'] == 'category':
+                # Los nulos no están en el índice y quedan como -1
+                outputs[column['name']][start:stop] = column['_index'].get_indexer(series)
+            else:
+                outputs[column['name']][start:stop] = series.fillna(0).to_numpy()
+            if column['nulls']:
+                column['_mask'][start:stop] = nulls
+        start = stop
+
+    for column in schema['columns']:
+        outputs[column['name']].flush()
+        column.pop('_index', None)
+        column.pop('_offset', None)
+        utf8 = column.pop('_utf8', None)
+        if utf8 is not None:
+            utf8.flush()
+        mask = column.pop('_mask', None)
+        if mask is not None:
+            np.save(store_path / f"{column['name']}.nulls.npy", np.packbits(mask))
+
+    with open(store_path / SCHEMA_FILE, 'w') as f:
+        json.dump(schema, f, indent=2)
+    return schema
+
+
+def _write_strings(column, offsets, series, start, stop):
+    """Añade un bloque de cadenas al buffer UTF-8 y escribe sus offsets (los nulos quedan vacíos)"""
+    encoded = series.fillna('').str.encode('utf-8')
+    ends = column['_offset'] + np.cumsum(encoded.str.len().to_numpy(), dtype=np.int64)
+    if start == 0:
+        offsets[0] = 0
+    offsets[start + 1:stop + 1] = ends
+    end = int(ends[-1])
+    column['_utf8'][column['_offset']:end] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    column['_offset'] = end
+
+
+def read_schema(store_path):
+    with open(Path(store_path) / SCHEMA_FILE, 'r') as f:
+        schema = json.load(f)
+    if schema.get('format') != FORMAT_NAME or schema.get('version') != FORMAT_VERSION:
+        raise ValueError(f"{store_path} no es un almacén {FORMAT_NAME} v{FORMAT_VERSION}")
+    return schema
+
+
+def open_columns(store_path, columns=None):
+    """
+    Abre las columnas sin copiarlas: devuelve {nombre: (tipo, valores, máscara, extra)}
+    con los valores mapeados en memoria (mmap de solo lectura). `extra` es el
+    diccionario de las columnas categóricas, el buffer UTF-8 (también mapeado)
+    de las de texto libre, o None.
+    """
+    store_path = Path(store_path)
+    schema = read_schema(store_path)
+    opened = {}
+    for column in schema['columns']:
+        name = column['name']
+        if columns is not None and name not in columns:
+            continue
+        values = np.load(store_path / f'{name}.npy', mmap_mode='r')
+        mask = None
+        if column['nulls']:
+            packed = np.load(store_path / f'{name}.nulls.npy')
+            mask = np.unpackbits(packed, count=schema['rows']).astype(bool)
+        extra = None
+        if column['kind'] == 'category':
+            with open(store_path / f'{name}.dict.json', 'r') as f:
+                extra = json.load(f)
+        elif column['kind'] == 'string':
+            extra = np.load(store_path / f'{name}.utf8.npy', mmap_mode='r')
+        opened[name] = (column['kind'], values, mask, extra)
+    return opened
+
+
+def _decode_strings(offsets, utf8, mask):
+    """Cadenas de un bloque a partir de sus offsets (filas + 1); NaN para los nulos"""
+    offsets = np.asarray(offsets, dtype=np.int64)
+    data = utf8[offsets[0]:offsets[-1]].tobytes()
+    bounds = offsets - offsets[0]
+    strings = np.empty(len(offsets) - 1, dtype=object)
+    for i in range(len(strings)):
+        strings[i] = data[bounds[i]:bounds[i + 1]].decode('utf-8')
+    if mask is not None:
+        strings[mask] = np.nan
+    return strings
+
+
+def _to_series(kind, values, mask, extra, start=None, stop=None):
+    if mask is not None:
+        mask = mask[start:stop]
+    if kind == 'string':
+        # Igual que read_csv: columna object con NaN en los nulos
+        rows = len(values) - 1
+        start, stop, _ = slice(start, stop).indices(rows)
+        return _decode_strings(values[start:stop + 1], extra, mask)
+    values = values[start:stop]
+    if kind == 'category':
+        return pd.Categorical.from_codes(np.asarray(values), categories=extra)
+    if mask is not None and mask.any():
+        # Igual que read_csv: una columna numérica con nulos se devuelve como float64 con NaN
+        values = np.asarray(values, dtype=np.float64).copy()
+        values[mask] = np.nan
+    return np.asarray(values)
+
+
+def load_passengers(store_path, columns=None):
+    """Carga un almacén columnar como DataFrame (categorías para cadenas, enteros estrechos)"""
+    opened = open_columns(store_path, columns)
+    return pd.DataFrame({
+        name: _to_series(*column) for name, column in opened.items()
+    })
+
+
+def iter_passengers(store_path, chunksize=100_000, columns=None):
+    """Recorre un almacén columnar en bloques de `chunksize` filas"""
+    rows = read_schema(store_path)['rows']
+    opened = open_columns(store_path, columns)
+    for start in range(0, rows, chunksize):
+        stop = min(start + chunksize, rows)
+        yield pd.DataFrame({
+            name: _to_series(*column, start, stop) for name, column in opened.items()
+        }, index=pd.RangeIndex(start, stop))
+
+
+def load_dataset(name, base_dir='.'):
+    """
+    Carga `train` o `test`: usa `<name>.tcol` si existe y si no `<name>.csv`
+    (del mismo modo que Django prefiere el modelo optimizado cuando está disponible)
+    """
+    base_dir = Path(base_dir)
+    store_path = base_dir / f'{name}{STORE_SUFFIX}'
+    if is_store(store_path):
+        print(f"📦 Cargando almacén columnar {store_path}")
+        return load_passengers(store_path)
+    return pd.read_csv(base_dir / f'{name}.csv')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("Uso: python scripts/passenger_store.py <entrada.csv> <salida.tcol>")
+        sys.exit(1)
+
+    csv_path, store_path = sys.argv[1], sys.argv[2]
+    schema = convert_csv(csv_path, store_path)
+    print(f"✅ {schema['rows']} registros convertidos a {store_path}")
+    for column in schema['columns']:
+        nulls = ' (con nulos)' if column['nulls'] else ''
+        print(f"  {column['name']}: {column['kind']} {column['dtype']}{nulls}")
@@ -0,0 +1,306 @@
+"""
+Acumuladores combinables para el análisis exploratorio en modo streaming
+Procesan el CSV por bloques en memoria constante y permiten combinar
+resultados parciales calculados en paralelo sobre fragmentos del archivo
+"""
+
+import json
+import math
+import random
+
+import numpy as np
+import pandas as pd
+
+from passenger_store import is_store, iter_passengers, read_schema
+
+AGE_BINS = [0, 16, 30, 50, 100]
+AGE_LABELS = ['0-16', '17-30', '31-50', '51+']
+GROUP_COLUMNS = ['Pclass', 'Sex', 'Title', 'Deck', 'Age_Group', 'Embarked']
+
+
+class RunningStats:
+    """Conteo, suma, media/varianza (Welford) y mínimo/máximo de una columna numérica"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """Agrega un bloque de valores ignorando los nulos"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        chunk = RunningStats()
+        chunk.count = len(values)
+        chunk.total = float(values.sum())
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Combina otro acumulador (fórmula paralela de Chan para la varianza)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.total, self.mean, self.m2 = other.count, other.total, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Varianza muestral (ddof=1, igual que pandas)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {
+            'count': self.count, 'total': self.total, 'mean': self.mean, 'm2': self.m2,
+            'min': self.min if self.count else None, 'max': self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data['count']
+        stats.total = data['total']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.min = data['min'] if data['min'] is not None else math.inf
+        stats.max = data['max'] if data['max'] is not None else -math.inf
+        return stats
+
+
+class QuantileSketch:
+    """
+    Sketch de cuantiles combinable basado en compactadores por niveles.
+    Cada nivel guarda como máximo `k` valores; al llenarse se ordena y se
+    promueve uno de cada dos valores al nivel siguiente con el doble de peso.
+    Mientras no se supera `k` valores el resultado es exacto.
+    """
+
+    def __init__(self, k=2048, seed=0):
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self._rng = random.Random(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.levels[0].extend(values.tolist())
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other):
+        for height, items in enumerate(other.levels):
+            if height >= len(self.levels):
+                self.levels.append([])
+            self.levels[height].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if len(level) >= self.k:
+                level.sort()
+                # Si hay un número impar de valores, el último se queda en este nivel
+                leftover = [level.pop()] if len(level) % 2 else []
+                offset = self._rng.randint(0, 1)
+                if height + 1 == len(self.levels):
+                    self.levels.append([])
+                self.levels[height + 1].extend(level[offset::2])
+                self.levels[height] = leftover
+            height += 1
+
+    def quantile(self, q):
+        """Cuantil aproximado (exacto con interpolación lineal si no hubo compactación)"""
+        if self.count == 0:
+            return math.nan
+        if len(self.levels) == 1:
+            return float(np.quantile(self.levels[0], q))
+
+        weighted = sorted(
+            (value, 2 ** height)
+            for height, items in enumerate(self.levels)
+            for value in items
+        )
+        total_weight = sum(weight for _, weight in weighted)
+        target = q * total_weight
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        return {'k': self.k, 'count': self.count, 'levels': self.levels}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data['k'])
+        sketch.count = data['count']
+        sketch.levels = [list(items) for items in data['levels']]
+        return sketch
+
+
+class PassengerSummary:
+    """Resumen combinable de pasajeros con todo lo necesario para el reporte exploratorio"""
+
+    def __init__(self, k=2048):
+        self.columns = None
+        self.rows = 0
+        self.survived = 0
+        self.nulls = {}
+        # grupo -> {valor: [pasajeros, sobrevivientes]}
+        self.groups = {name: {} for name in GROUP_COLUMNS}
+        self.age = RunningStats()
+        self.fare = RunningStats()
+        self.age_sketch = QuantileSketch(k=k)
+        self.fare_sketch = QuantileSketch(k=k)
+
+    def update(self, chunk):
+        """Agrega un bloque del CSV de entrenamiento"""
+        chunk = chunk.copy()
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+
+        chunk['Title'] = chunk['Name'].str.extract(r' ([A-Za-z]+)\.', expand=False)
+        chunk['Deck'] = chunk['Cabin'].str[0].fillna('U')
+        chunk['Age_Group'] = pd.cut(chunk['Age'], bins=AGE_BINS, labels=AGE_LABELS)
+
+        self.rows += len(chunk)
+        self.survived += int(chunk['Survived'].sum())
+
+        for col, nulls in chunk.isnull().sum().items():
+            self.nulls[col] = self.nulls.get(col, 0) + int(nulls)
+
+        for name in GROUP_COLUMNS:
+            grouped = chunk.groupby(name, observed=True)['Survived'].agg(['size', 'sum'])
+            counts = self.groups[name]
+            for key, row in grouped.iterrows():
+                key = key.item() if hasattr(key, 'item') else key
+                entry = counts.setdefault(key, [0, 0])
+                entry[0] += int(row['size'])
+                entry[1] += int(row['sum'])
+
+        self.age.update(chunk['Age'])
+        self.fare.update(chunk['Fare'])
+        self.age_sketch.update(chunk['Age'])
+        self.fare_sketch.update(chunk['Fare'])
+
+    def merge(self, other):
+        """Combina el resumen de otro fragmento"""
+        if self.columns is None:
+            self.columns = other.columns
+        self.rows += other.rows
+        self.survived += other.survived
+        for col, nulls in other.nulls.items():
+            self.nulls[col] = self.nulls.get(col, 0) + nulls
+        for name, other_counts in other.groups.items():
+            counts = self.groups.setdefault(name, {})
+            for key, (count, survived) in other_counts.items():
+                entry = counts.setdefault(key, [0, 0])
+                entry[0] += count
+                entry[1] += survived
+        self.age.merge(other.age)
+        self.fare.merge(other.fare)
+        self.age_sketch.merge(other.age_sketch)
+        self.fare_sketch.merge(other.fare_sketch)
+
+    def group(self, name):
+        """Devuelve [(valor, pasajeros, sobrevivientes)] ordenado por frecuencia descendente"""
+        items = [(key, count, survived) for key, (count, survived) in self.groups[name].items()]
+        return sorted(items, key=lambda item: -item[1])
+
+    def to_dict(self):
+        return {
+            'columns': self.columns,
+            'rows': self.rows,
+            'survived': self.survived,
+            'nulls': self.nulls,
+            'groups': {
+                name: [[key, count, survived] for key, (count, survived) in counts.items()]
+                for name, counts in self.groups.items()
+            },
+            'age': self.age.to_dict(),
+            'fare': self.fare.to_dict(),
+            'age_sketch': self.age_sketch.to_dict(),
+            'fare_sketch': self.fare_sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(k=data['age_sketch']['k'])
+        summary.columns = data['columns']
+        summary.rows = data['rows']
+        summary.survived = data['survived']
+        summary.nulls = dict(data['nulls'])
+        summary.groups = {
+            name: {key: [count, survived] for key, count, survived in entries}
+            for name, entries in data['groups'].items()
+        }
+        summary.age = RunningStats.from_dict(data['age'])
+        summary.fare = RunningStats.from_dict(data['fare'])
+        summary.age_sketch = QuantileSketch.from_dict(data['age_sketch'])
+        summary.fare_sketch = QuantileSketch.from_dict(data['fare_sketch'])
+        return summary
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def iter_chunks(path, chunksize=100_000):
+    """Bloques de un CSV o de un almacén columnar (.tcol)"""
+    if is_store(path):
+        return iter_passengers(path, chunksize=chunksize)
+    return pd.read_csv(path, chunksize=chunksize)
+
+
+def summarize_csv(paths, chunksize=100_000, k=2048):
+    """Recorre uno o varios CSV (o almacenes .tcol) por bloques y devuelve un PassengerSummary"""
+    summary = PassengerSummary(k=k)
+    for path in paths:
+        for chunk in iter_chunks(path, chunksize):
+            summary.update(chunk)
+    return summary
+
+
+def count_rows(path, chunksize=100_000):
+    """Cuenta los registros de un CSV sin cargarlo completo"""
+    if is_store(path):
+        return read_schema(path)['rows']
+    return sum(len(chunk) for chunk in pd.read_csv(path, chunksize=chunksize, usecols=[0]))
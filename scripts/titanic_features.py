@@ -0,0 +1,57 @@
+"""
+Ingeniería de características compartida por los scripts de entrenamiento
+Una sola definición de prepare_data para 02, 03, 04 y 05: si cada script
+tuviera su copia, las codificaciones podrían divergir sin que nadie lo note.
+El featurizador de Django (django_api/predictions/features.py) reproduce
+este mismo esquema para una sola petición.
+"""
+
+import pandas as pd
+
+TITLE_PATTERN = r' ([A-Za-z]+)\.'
+COMMON_TITLES = ['Master', 'Miss', 'Mr', 'Mrs']
+RARE_TITLES = ['Dr', 'Rev', 'Col', 'Major', 'Capt', 'Jonkheer', 'Don', 'Sir',
+               'Lady', 'Countess', 'Dona', 'Mme', 'Mlle', 'Ms']
+AGE_BINS = [0, 16, 30, 50, 100]
+AGE_LABELS = ['0-16', '17-30', '31-50', '51+']
+
+# Columnas que no son features del modelo
+EXCLUDE_COLUMNS = ['PassengerId', 'Survived', 'Name', 'Ticket', 'Cabin', 'Age']
+
+
+def prepare_data(df):
+    """Limpia y prepara los datos para el modelo con ingeniería de características avanzada"""
+    df = df.copy()
+
+    # Rellenar valores nulos
+    df['Age'] = df['Age'].fillna(df['Age'].median())
+    df['Fare'] = df['Fare'].fillna(df['Fare'].median())
+    df['Embarked'] = df['Embarked'].fillna(df['Embarked'].mode()[0])
+
+    # Extraer título del nombre
+    df['Title'] = df['Name'].str.extract(TITLE_PATTERN, expand=False)
+    # Agrupar títulos raros en 'Rare'
+    df['Title'] = df['Title'].replace(RARE_TITLES, 'Rare')
+
+    # Extraer cubierta (Deck) de la cabina
+    df['Deck'] = df['Cabin'].str[0].fillna('U')  # U = Unknown
+
+    # Crear grupos de edad
+    df['Age_Group'] = pd.cut(df['Age'], bins=AGE_BINS, labels=AGE_LABELS)
+
+    # Crear feature de tamaño de familia
+    df['FamilySize'] = df['SibSp'] + df['Parch'] + 1
+
+    # Crear feature de si viaja solo
+    df['IsAlone'] = (df['FamilySize'] == 1).astype(int)
+
+    # One-Hot Encoding para variables categóricas
+    df = pd.get_dummies(df, columns=['Sex', 'Embarked', 'Title', 'Deck', 'Age_Group'],
+                        drop_first=False)
+
+    return df
+
+
+def feature_columns(prepared_df):
+    """Features del modelo, en el orden de las columnas de prepare_data"""
+    return [col for col in prepared_df.columns if col not in EXCLUDE_COLUMNS]